@@ -1,5 +1,6 @@
 import streamlit as st
-from PIL import Image
+
+from utils.assets import load_image
 
 st.set_page_config(
     page_title="Dessy Saidah | Data Science Portfolio",
@@ -7,8 +8,9 @@ st.set_page_config(
     layout="wide"
 )
 
-header_image = Image.open("assets/header.png")
-st.image(header_image, width=900)
+# The 1600px source is under 2x the display width, so it is kept at full
+# size for high-DPI screens and only re-encoded as WebP
+st.image(load_image("assets/header.png", 1600), width=900)
 
 st.title("Dessy Saidah | Data Science Portfolio ✨")
 st.write(
@@ -0,0 +1,107 @@
+"""Cold-start import-time budget for every page.
+
+Each page gets a fresh interpreter (as after a container restart) and is
+rendered once with no user input. The first render time, excluding the
+`import streamlit` baseline, must stay under the page budget, and none of
+the heavy ML libraries may be imported before the user asks for them:
+
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --out cold_start.json
+
+Exits non-zero when a page is over budget.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from benchmarks.run import PAGES, ROOT
+
+# Seconds for the first render, on top of `import streamlit`
+BUDGETS_S = {
+    "home": 0.5,
+    "churn": 0.5,
+    "fraud": 0.5,
+    "delivery": 0.5,
+    "ecommerce": 2.0,
+}
+# Libraries that must not be loaded before the page needs them. Anything
+# Streamlit itself already imports (plotly and PIL in 1.31) is not counted.
+HEAVY_MODULES = {
+    "home": ["sklearn", "catboost", "xgboost", "plotly", "PIL"],
+    "churn": ["sklearn", "catboost", "xgboost", "plotly"],
+    "fraud": ["sklearn", "catboost", "xgboost", "plotly"],
+    "delivery": ["sklearn", "catboost", "xgboost", "plotly"],
+    "ecommerce": ["sklearn", "catboost", "xgboost"],
+}
+ECOMMERCE_ROWS = 10_000
+
+
+def _measure(page):
+    os.chdir(ROOT)
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+    start = time.perf_counter()
+    import streamlit  # noqa: F401
+    from streamlit.testing.v1 import AppTest
+    baseline = time.perf_counter() - start
+    preloaded = set(sys.modules)
+
+    at = AppTest.from_file(str(PAGES[page]), default_timeout=600)
+    if page == "ecommerce":
+        from benchmarks.run import ecommerce_data
+
+        with ecommerce_data(ECOMMERCE_ROWS):
+            start = time.perf_counter()
+            at.run()
+    else:
+        start = time.perf_counter()
+        at.run()
+    first_render = time.perf_counter() - start
+
+    loaded = [
+        m for m in HEAVY_MODULES[page]
+        if m in sys.modules and m not in preloaded
+    ]
+    return {
+        "page": page,
+        "streamlit_import_s": round(baseline, 4),
+        "first_render_s": round(first_render, 4),
+        "budget_s": BUDGETS_S[page],
+        "heavy_loaded": loaded,
+        "error": str(at.exception[0].value) if at.exception else None,
+        "ok": first_render <= BUDGETS_S[page] and not loaded and not at.exception,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--out")
+    args = parser.parse_args(argv)
+
+    results = []
+    ctx = get_context("spawn")
+    for page in args.pages:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            r = pool.submit(_measure, page).result()
+        results.append(r)
+        status = "ok" if r["ok"] else "OVER BUDGET"
+        extra = f" heavy={r['heavy_loaded']}" if r["heavy_loaded"] else ""
+        extra += f" error={r['error']}" if r["error"] else ""
+        print(f"{page:<10} {r['first_render_s']:>7.3f}s / {r['budget_s']:.1f}s  {status}{extra}")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2))
+
+    sys.exit(0 if all(r["ok"] for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
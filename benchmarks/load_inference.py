@@ -0,0 +1,171 @@
+"""Load test for the cross-session inference scheduler.
+
+Simulates many concurrent Streamlit sessions (one thread each) sending
+single-row predictions, first straight to the model and then through
+`utils.inference.BatchScheduler`, and reports throughput, latency
+percentiles and the batch sizes the scheduler formed:
+
+    python -m benchmarks.load_inference --sessions 300 --requests 20
+    python -m benchmarks.load_inference --model delivery --out load.json
+"""
+
+import argparse
+import json
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from utils.inference import BatchScheduler
+
+TRAIN_ROWS = 20_000
+
+
+def churn_model():
+    """Telco churn pipeline as trained by the churn page; one-row frames."""
+    from sklearn.compose import ColumnTransformer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    from benchmarks.synthetic import churn_frame
+
+    df = churn_frame(TRAIN_ROWS)
+    df["TotalCharges"] = df["TotalCharges"].str.strip().replace("", np.nan).astype(float)
+    df["TotalCharges"] = df["TotalCharges"].fillna(df["TotalCharges"].median())
+    y = (df.pop("Churn") == "Yes").astype(int)
+    X = df.drop(columns=["customerID"])
+
+    numeric = X.select_dtypes(include=["int64", "float64"]).columns.tolist()
+    categorical = [c for c in X.columns if c not in numeric]
+    pipeline = Pipeline([
+        ("preprocess", ColumnTransformer([
+            ("num", StandardScaler(), numeric),
+            ("cat", OneHotEncoder(handle_unknown="ignore"), categorical),
+        ])),
+        ("model", LogisticRegression(max_iter=2000)),
+    ]).fit(X, y)
+
+    rows = [X.iloc[[i]].reset_index(drop=True) for i in range(200)]
+    return pipeline.predict_proba, rows
+
+
+def delivery_model():
+    """XGBoost regressor on the delivery feature layout; one-row frames."""
+    import joblib
+    from sklearn.preprocessing import StandardScaler
+    from xgboost import XGBRegressor
+
+    from benchmarks.synthetic import delivery_frame
+    from utils.delivery import MODEL_DIR, prepare_features
+
+    num_cols = joblib.load(MODEL_DIR / "num_cols.pkl")
+    final_features = joblib.load(MODEL_DIR / "final_feature_columns.pkl")
+
+    df = delivery_frame(TRAIN_ROWS)
+    scaler = StandardScaler().fit(df[num_cols])
+    X = prepare_features(df, scaler, num_cols, final_features)
+    model = XGBRegressor(n_estimators=200, max_depth=6).fit(X, df["Distance_km"] * 2 + 15)
+
+    rows = [X.iloc[[i]].reset_index(drop=True) for i in range(200)]
+    return model.predict, rows
+
+
+MODELS = {"churn": churn_model, "delivery": delivery_model}
+
+
+def _drive(call, rows, sessions, requests):
+    """Run `sessions` threads, each making `requests` sequential calls."""
+    latencies = [[] for _ in range(sessions)]
+    barrier = threading.Barrier(sessions + 1)
+
+    def session(i):
+        barrier.wait()
+        for j in range(requests):
+            row = rows[(i * requests + j) % len(rows)]
+            start = time.perf_counter()
+            call(row)
+            latencies[i].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    lat = np.concatenate([np.array(v) for v in latencies]) * 1000
+    p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+    return {
+        "requests": int(lat.size),
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_sec": round(lat.size / elapsed, 1),
+        "latency_ms_p50": round(float(p50), 2),
+        "latency_ms_p95": round(float(p95), 2),
+        "latency_ms_p99": round(float(p99), 2),
+    }
+
+
+def run(model, sessions, requests, max_batch_size, max_wait_ms):
+    predict, rows = MODELS[model]()
+    predict(rows[0])  # warm up
+
+    direct = _drive(predict, rows, sessions, requests)
+
+    scheduler = BatchScheduler(
+        predict, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, name=model
+    )
+    batched = _drive(scheduler.predict, rows, sessions, requests)
+    batched["scheduler"] = scheduler.metrics()
+    scheduler.close()
+
+    # Results must not depend on which batch a row landed in
+    check = BatchScheduler(predict, max_batch_size=max_batch_size, name="check")
+    futures = [check.submit(r) for r in rows]
+    expected = np.concatenate([predict(r) for r in rows])
+    got = np.concatenate([f.result() for f in futures])
+    check.close()
+
+    return {
+        "model": model,
+        "sessions": sessions,
+        "requests_per_session": requests,
+        "max_batch_size": max_batch_size,
+        "max_wait_ms": max_wait_ms,
+        "direct": direct,
+        "batched": batched,
+        "results_match": bool(np.allclose(expected, got, rtol=1e-5, atol=1e-6)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", choices=list(MODELS), default="churn")
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--requests", type=int, default=20, help="requests per session")
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--out")
+    args = parser.parse_args(argv)
+
+    report = run(args.model, args.sessions, args.requests,
+                 args.max_batch_size, args.max_wait_ms)
+
+    for mode in ("direct", "batched"):
+        r = report[mode]
+        print(f"{mode:<8} {r['requests_per_sec']:>10,.0f} req/s   "
+              f"p50 {r['latency_ms_p50']:>8.2f} ms   p95 {r['latency_ms_p95']:>8.2f} ms   "
+              f"p99 {r['latency_ms_p99']:>8.2f} ms")
+    m = report["batched"]["scheduler"]
+    print(f"batches {m['batches']:,}, mean batch size {m['mean_batch_size']:.1f}, "
+          f"max {m['max_batch_size_seen']}; results match: {report['results_match']}")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
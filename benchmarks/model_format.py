@@ -0,0 +1,170 @@
+"""Delivery model: joblib pickle vs native booster file.
+
+Compares the `XGBRegressor` pickle (DataFrame predict) against booster
+files loaded with `xgb.Booster` and predicted in place from NumPy
+(`utils.delivery.BoosterModel`):
+
+- cold load: a fresh interpreter importing xgboost (which itself pulls in
+  sklearn when installed), then loading the model; import and load time
+  are reported separately, with the resulting peak RSS
+- single-row latency through the page's preprocessing output
+- batch throughput at several sizes
+
+Without `projects/models/xgb_model.pkl` (it is not in the repo) a model of
+the same feature layout is trained on synthetic orders first:
+
+    python -m benchmarks.model_format
+    python -m benchmarks.model_format --nthread 1 --out model_format.json
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.run import ROOT
+from utils import delivery
+
+FORMATS = ("pkl", "ubj", "json")
+SINGLE_CALLS = 500
+BATCH_SIZES = (1_000, 100_000)
+
+
+def prepare(model_dir):
+    """Copy or train the pickle into `model_dir` and convert it."""
+    from benchmarks.synthetic import delivery_model
+    from scripts.convert_delivery_model import convert
+
+    source = delivery.model_path(delivery.MODEL_DIR, "pkl")
+    if source.exists():
+        shutil.copy(source, delivery.model_path(model_dir, "pkl"))
+        origin = str(source)
+    else:
+        delivery_model(model_dir)
+        origin = "synthetic"
+    parity = {fmt: convert(model_dir, fmt)[1] for fmt in FORMATS[1:]}
+    return origin, parity
+
+
+# Run in a bare interpreter: nothing but utils.delivery and the model imports
+COLD_LOAD = """
+import json, resource, sys, time
+start = time.perf_counter()
+import xgboost
+from utils.delivery import load_model
+imported = time.perf_counter()
+load_model(sys.argv[1], int(sys.argv[3]) or None, fmt=sys.argv[2])
+print(json.dumps([imported - start, time.perf_counter() - imported,
+                  resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024]))
+"""
+
+
+def cold_load(model_dir, fmt, nthread, repeats):
+    runs = []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", COLD_LOAD, str(model_dir), fmt, str(nthread or 0)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    import_s, load_s, rss = np.median(np.array(runs), axis=0)
+    return {
+        "import_s": round(float(import_s), 4),
+        "load_s": round(float(load_s), 4),
+        "peak_rss_mb": round(float(rss), 1),
+    }
+
+
+def _features(n):
+    import joblib
+
+    from benchmarks.synthetic import delivery_frame
+
+    scaler = joblib.load(delivery.MODEL_DIR / "scaler.pkl")
+    num_cols = joblib.load(delivery.MODEL_DIR / "num_cols.pkl")
+    final_features = joblib.load(delivery.MODEL_DIR / "final_feature_columns.pkl")
+    return delivery.prepare_features(delivery_frame(n), scaler, num_cols, final_features)
+
+
+def latency(model, X):
+    rows = [X.iloc[[i]] for i in range(min(SINGLE_CALLS, len(X)))]
+    model.predict(rows[0])  # warm up
+    single = []
+    for row in rows:
+        start = time.perf_counter()
+        model.predict(row)
+        single.append(time.perf_counter() - start)
+    p50, p95 = np.percentile(np.array(single) * 1000, [50, 95])
+
+    batch = {}
+    for size in BATCH_SIZES:
+        chunk = X.iloc[:size]
+        runs = []
+        for _ in range(3):
+            start = time.perf_counter()
+            model.predict(chunk)
+            runs.append(time.perf_counter() - start)
+        best = min(runs)
+        batch[str(size)] = {"s": round(best, 4), "rows_per_sec": round(size / best, 1)}
+    return {
+        "single_ms_p50": round(float(p50), 3),
+        "single_ms_p95": round(float(p95), 3),
+        "batch": batch,
+    }
+
+
+def run(nthread=None, repeats=3):
+    model_dir = Path(tempfile.mkdtemp(prefix="delivery_model_"))
+    try:
+        origin, parity = prepare(model_dir)
+        X = _features(max(BATCH_SIZES))
+
+        results = {}
+        for fmt in FORMATS:
+            model = delivery.load_model(model_dir, nthread, fmt=fmt)
+            results[fmt] = {
+                "file_kb": round(delivery.model_path(model_dir, fmt).stat().st_size / 1024, 1),
+                **cold_load(model_dir, fmt, nthread, repeats),
+                **latency(model, X),
+            }
+    finally:
+        shutil.rmtree(model_dir, ignore_errors=True)
+
+    return {
+        "model": origin,
+        "nthread": nthread,
+        "max_abs_diff_vs_pickle": parity,
+        "formats": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nthread", type=int, help="prediction threads (default: xgboost's)")
+    parser.add_argument("--repeats", type=int, default=3, help="cold loads per format")
+    parser.add_argument("--out")
+    args = parser.parse_args(argv)
+
+    report = run(args.nthread, args.repeats)
+
+    print(f"model: {report['model']}, nthread: {report['nthread'] or 'default'}")
+    for fmt, r in report["formats"].items():
+        batch = "   ".join(
+            f"{size} rows {b['rows_per_sec']:>12,.0f}/s" for size, b in r["batch"].items()
+        )
+        print(f"{fmt:<5} import {r['import_s']:>6.3f}s  load {r['load_s']:>6.3f}s  rss {r['peak_rss_mb']:>6.0f} MB   "
+              f"single p50 {r['single_ms_p50']:>6.3f} ms  p95 {r['single_ms_p95']:>6.3f} ms   {batch}")
+    print("max |diff| vs pickle:", {k: f"{v:.1e}" for k, v in report["max_abs_diff_vs_pickle"].items()})
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
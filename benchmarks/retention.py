@@ -0,0 +1,81 @@
+"""Retention simulation budget on a 100k-customer RFM table.
+
+Times `simulate_retention` for a sweep of slider values (each a cache miss
+on the page) on synthetic customers, and fails when the median call is
+over the budget:
+
+    python -m benchmarks.retention
+    python -m benchmarks.retention --customers 250000 --out retention.json
+
+Exits non-zero when over budget.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from utils.retention import build_strata, simulate_retention
+
+BUDGET_S = 0.2
+CUSTOMERS = 100_000
+# (reactivation, repeat uplift) pairs, as the page's sliders send them
+RATES = [(r / 100, u / 100) for r in (0, 10, 20, 30) for u in (5, 10, 20)]
+
+
+def rfm_table(customers, seed=0):
+    from benchmarks.synthetic import sales_frames
+
+    # Not every generated user id places an order; draw spare lines
+    _, rfm = sales_frames(customers * 4, seed=seed)
+    return rfm.head(customers)
+
+
+def run(customers=CUSTOMERS):
+    rfm = rfm_table(customers)
+    start = time.perf_counter()
+    strata = build_strata(rfm)
+    build_s = time.perf_counter() - start
+
+    simulate_retention(strata, *RATES[0])  # warm up
+    calls = []
+    for rates in RATES:
+        start = time.perf_counter()
+        simulate_retention(strata, *rates)
+        calls.append(time.perf_counter() - start)
+    median, worst = float(np.median(calls)), max(calls)
+    return {
+        "customers": len(rfm),
+        "strata": len(strata),
+        "build_strata_s": round(build_s, 4),
+        "simulate_median_s": round(median, 4),
+        "simulate_max_s": round(worst, 4),
+        "budget_s": BUDGET_S,
+        "ok": median <= BUDGET_S,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--customers", type=int, default=CUSTOMERS)
+    parser.add_argument("--out")
+    args = parser.parse_args(argv)
+
+    r = run(args.customers)
+    status = "ok" if r["ok"] else "OVER BUDGET"
+    print(
+        f"{r['customers']:,} customers, {r['strata']} strata: build {r['build_strata_s']:.3f}s, "
+        f"simulate median {r['simulate_median_s']:.3f}s (max {r['simulate_max_s']:.3f}s) "
+        f"/ {r['budget_s']:.1f}s  {status}"
+    )
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(r, indent=2))
+    if not r["ok"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
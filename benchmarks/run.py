@@ -0,0 +1,412 @@
+"""Headless benchmark suite for every page's hot path.
+
+Each page is driven through Streamlit's AppTest harness with synthetic data
+at several sizes (Home and the single-order delivery page run once). For
+every (page, size) pair the synthetic inputs are written to a temporary
+directory by one process and the page is driven by another, so peak RSS
+and Streamlit caches belong to the page alone. A render that shows
+`st.error` counts as a failure. Results are written as JSON:
+
+    python -m benchmarks.run --sizes 10000 100000 --out bench.json
+    python -m benchmarks.run --compare old.json new.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from importlib import metadata
+from multiprocessing import get_context
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = {
+    "home": ROOT / "Home.py",
+    "churn": ROOT / "pages" / "2_Churn Prediction.py",
+    "fraud": ROOT / "pages" / "3_Fraud Risk Prediction.py",
+    "delivery": ROOT / "pages" / "4_Delivery Time Prediction.py",
+    "ecommerce": ROOT / "pages" / "5_E-Commerce Sales & Customer Segmentation.py",
+}
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+APP_TIMEOUT = 1800
+DELIVERY_RERUNS = 20
+# Pages without a data-size knob run once, at this size, whatever --sizes says:
+# Home has no input and the delivery page scores one order per rerun
+FIXED_SIZES = {"home": 0, "delivery": DELIVERY_RERUNS}
+
+
+class UploadedCSV(io.BytesIO):
+    """Stand-in for Streamlit's UploadedFile (AppTest cannot upload)."""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+        self.type = "text/csv"
+        self.size = len(data)
+
+
+def _uploader(data, name="upload.csv"):
+    # Fresh buffer on every call: each rerun reads the upload from the start.
+    return mock.patch(
+        "streamlit.file_uploader",
+        side_effect=lambda *args, **kwargs: UploadedCSV(data, name),
+    )
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _widget(elements, label):
+    for el in elements:
+        if el.label == label:
+            return el
+    raise LookupError(f"No widget labelled {label!r}")
+
+
+def _app(page):
+    from streamlit.testing.v1 import AppTest
+
+    return AppTest.from_file(str(PAGES[page]), default_timeout=APP_TIMEOUT)
+
+
+def _check(at):
+    """Raise if the render hit an exception or showed an error message."""
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    if at.error:
+        raise RuntimeError(f"page showed an error: {at.error[0].value}")
+
+
+def _timed_run(at, stages, name, check=True):
+    start = time.perf_counter()
+    at.run()
+    stages[name] = time.perf_counter() - start
+    if check:
+        _check(at)
+    elif at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+
+# ======================
+# SYNTHETIC INPUTS
+# ======================
+# Written by a separate process, so the generators' memory is not counted
+# in the page's peak RSS
+def data_churn(n, data_dir):
+    from benchmarks.synthetic import churn_frame
+
+    churn_frame(n).to_csv(data_dir / "upload.csv", index=False)
+
+
+def data_fraud(n, data_dir):
+    import joblib
+    from benchmarks.synthetic import fraud_frame
+
+    feature_cols = joblib.load(ROOT / "projects" / "models" / "feature_columns.pkl")
+    fraud_frame(n, feature_cols=feature_cols).to_csv(data_dir / "upload.csv", index=False)
+
+
+def data_delivery(n, data_dir):
+    from benchmarks.synthetic import delivery_frame, delivery_model
+    from utils import delivery
+
+    # The page scores one order per rerun; `n` orders are replayed
+    delivery_frame(n).to_csv(data_dir / "orders.csv", index=False)
+
+    # xgb_model.pkl is not in the repo: train a stand-in with the same layout
+    if not any(delivery.model_path(delivery.MODEL_DIR, f).exists() for f in delivery.MODEL_FORMATS):
+        delivery_model(data_dir / "models")
+
+
+def ecommerce_files(n, data_dir):
+    from benchmarks.synthetic import sales_frames
+
+    sales, rfm = sales_frames(n)
+    sales.to_csv(Path(data_dir) / "base_sales.csv", index=False)
+    rfm.to_csv(Path(data_dir) / "rfm_table.csv", index=False)
+
+
+DATA = {
+    "churn": data_churn,
+    "fraud": data_fraud,
+    "delivery": data_delivery,
+    "ecommerce": ecommerce_files,
+}
+
+
+def _build_data(page, n, data_dir):
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    if page in DATA:
+        DATA[page](n, Path(data_dir))
+
+
+# ======================
+# SCENARIOS
+# ======================
+def scenario_home(n, data_dir):
+    at = _app("home")
+    stages = {}
+    _timed_run(at, stages, "render")
+    return 0, stages
+
+
+def scenario_churn(n, data_dir):
+    data = (data_dir / "upload.csv").read_bytes()
+    stages = {}
+
+    with _uploader(data):
+        at = _app("churn")
+        # Until the churn column is chosen the page shows a "must be binary" error
+        _timed_run(at, stages, "load", check=False)
+
+        _widget(at.selectbox, "Choose the churn column (binary)").set_value("Churn")
+        _timed_run(at, stages, "preprocess")
+
+        _widget(at.button, "🚀 Train Logistic Regression Model").click()
+        _timed_run(at, stages, "train")
+
+        _widget(at.button, "🔮 Predict Churn").click()
+        _timed_run(at, stages, "predict")
+
+    return n, stages
+
+
+def scenario_fraud(n, data_dir):
+    data = (data_dir / "upload.csv").read_bytes()
+    stages = {}
+
+    with _uploader(data):
+        at = _app("fraud")
+        _timed_run(at, stages, "score")
+
+    return n, stages
+
+
+@contextmanager
+def _delivery_model(data_dir):
+    """Point the page at the stand-in model written by `data_delivery`, if any."""
+    from functools import partial
+
+    from utils import delivery
+
+    model_dir = data_dir / "models"
+    if not model_dir.exists():
+        yield
+        return
+    load = partial(delivery.load_artifacts, model_dir)
+    with mock.patch.object(delivery, "load_artifacts", load):
+        yield
+
+
+def scenario_delivery(n, data_dir):
+    import pandas as pd
+
+    rows = pd.read_csv(data_dir / "orders.csv").to_dict("records")
+    stages = {}
+
+    with _delivery_model(data_dir):
+        at = _app("delivery")
+        _timed_run(at, stages, "load")
+
+        start = time.perf_counter()
+        for row in rows:
+            _widget(at.number_input, "Distance (km)").set_value(row["Distance_km"])
+            _widget(at.slider, "Order Hour").set_value(int(row["Order_Hour"]))
+            _widget(at.selectbox, "Multiple Deliveries").set_value(int(row["multiple_deliveries"]))
+            _widget(at.selectbox, "Traffic Density").set_value(row["Road_traffic_density"])
+            _widget(at.selectbox, "Weather Conditions").set_value(row["Weather_conditions"])
+            _widget(at.selectbox, "Festival").set_value(row["Festival"])
+            _widget(at.selectbox, "City").set_value(row["City"])
+            _widget(at.slider, "Driver Age").set_value(int(row["Delivery_person_Age"]))
+            _widget(at.slider, "Driver Rating").set_value(float(row["Delivery_person_Ratings"]))
+            _widget(at.slider, "Vehicle Condition").set_value(int(row["Vehicle_condition"]))
+            _widget(at.button, "Predict Delivery Time").click()
+            at.run()
+            _check(at)
+            if not at.success:
+                raise RuntimeError("no delivery time was predicted")
+        stages["predict"] = time.perf_counter() - start
+
+    return len(rows), stages
+
+
+@contextmanager
+def _redirect_ecommerce(data_dir):
+    """Point the dashboard's `read_csv` calls at the files in `data_dir`."""
+    import pandas as pd
+
+    read_csv = pd.read_csv
+    overrides = {
+        "base_sales.csv": Path(data_dir) / "base_sales.csv",
+        "rfm_table.csv": Path(data_dir) / "rfm_table.csv",
+    }
+
+    def redirected(path, *args, **kwargs):
+        name = Path(path).name if isinstance(path, (str, os.PathLike)) else None
+        return read_csv(overrides.get(name, path), *args, **kwargs)
+
+    with mock.patch("pandas.read_csv", redirected):
+        yield
+
+
+@contextmanager
+def ecommerce_data(n):
+    """Point the dashboard's `read_csv` calls at synthetic sales/RFM files."""
+    with tempfile.TemporaryDirectory(prefix="bench_ecommerce_") as tmp:
+        ecommerce_files(n, tmp)
+        with _redirect_ecommerce(tmp):
+            yield
+
+
+def scenario_ecommerce(n, data_dir):
+    stages = {}
+
+    with _redirect_ecommerce(data_dir):
+        at = _app("ecommerce")
+        _timed_run(at, stages, "dashboard")
+
+        _widget(at.slider, "Reactivation Rate (%)").set_value(20)
+        _timed_run(at, stages, "simulation_rerun")
+
+    return n, stages
+
+
+SCENARIOS = {
+    "home": scenario_home,
+    "churn": scenario_churn,
+    "fraud": scenario_fraud,
+    "delivery": scenario_delivery,
+    "ecommerce": scenario_ecommerce,
+}
+
+
+# ======================
+# RUNNER
+# ======================
+def _run_one(page, n, data_dir):
+    os.chdir(ROOT)  # pages load artifacts with repo-relative paths
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+    result = {"page": page, "size": n}
+    try:
+        rows, stages = SCENARIOS[page](n, Path(data_dir))
+        wall = sum(stages.values())
+        result.update(
+            status="ok",
+            rows=rows,
+            wall_s=round(wall, 4),
+            rows_per_sec=round(rows / wall, 1) if rows and wall else None,
+            stages_s={k: round(v, 4) for k, v in stages.items()},
+        )
+    except Exception as exc:
+        result.update(
+            status="error",
+            error=f"{type(exc).__name__}: {exc}",
+            traceback=traceback.format_exc(limit=5),
+        )
+    result["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+    return result
+
+
+def _metadata():
+    versions = {}
+    for pkg in ["streamlit", "pandas", "numpy", "scikit-learn", "catboost",
+                "xgboost", "plotly"]:
+        try:
+            versions[pkg] = metadata.version(pkg)
+        except metadata.PackageNotFoundError:
+            versions[pkg] = None
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+            text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": versions,
+    }
+
+
+def run(pages, sizes):
+    results = []
+    ctx = get_context("spawn")
+    for page in pages:
+        for n in ([FIXED_SIZES[page]] if page in FIXED_SIZES else sizes):
+            with tempfile.TemporaryDirectory(prefix=f"bench_{page}_") as data_dir:
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    pool.submit(_build_data, page, n, data_dir).result()
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    result = pool.submit(_run_one, page, n, data_dir).result()
+            results.append(result)
+            print(_format_row(result), flush=True)
+    return {"meta": _metadata(), "results": results}
+
+
+def _format_row(r):
+    if r["status"] != "ok":
+        return f"{r['page']:<10} {r['size']:>9,}  ERROR {r['error']}"
+    rps = f"{r['rows_per_sec']:>12,.0f}" if r["rows_per_sec"] else f"{'-':>12}"
+    return (f"{r['page']:<10} {r['size']:>9,}  {r['wall_s']:>9.3f}s "
+            f"{rps} rows/s  {r['peak_rss_mb']:>8.1f} MB")
+
+
+def compare(old_path, new_path):
+    old = json.loads(Path(old_path).read_text())
+    new = json.loads(Path(new_path).read_text())
+    index = {(r["page"], r["size"]): r for r in old["results"]}
+
+    print(f"{'page':<10} {'size':>9}  {'wall old':>9} {'wall new':>9} {'delta':>8}"
+          f"  {'rss old':>8} {'rss new':>8}")
+    for r in new["results"]:
+        base = index.get((r["page"], r["size"]))
+        if base is None or r["status"] != "ok" or base["status"] != "ok":
+            print(f"{r['page']:<10} {r['size']:>9,}  n/a")
+            continue
+        delta = (r["wall_s"] - base["wall_s"]) / base["wall_s"] if base["wall_s"] else 0.0
+        print(f"{r['page']:<10} {r['size']:>9,}  {base['wall_s']:>8.3f}s {r['wall_s']:>8.3f}s"
+              f" {delta:>+7.1%}  {base['peak_rss_mb']:>7.1f}M {r['peak_rss_mb']:>7.1f}M")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--out", default="bench_output.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run(args.pages, args.sizes)
+    Path(args.out).write_text(json.dumps(report, indent=2))
+    print(f"Report written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Synthetic datasets matching the schemas each page expects.
+
+All generators are vectorized so 1M-row frames build in a few seconds.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils import fraud
+
+# ======================
+# CHURN (Kaggle Telco Customer Churn)
+# ======================
+YES_NO = ["Yes", "No"]
+INTERNET_ADDON = ["Yes", "No", "No internet service"]
+
+TELCO_CATEGORIES = {
+    "gender": ["Female", "Male"],
+    "Partner": YES_NO,
+    "Dependents": YES_NO,
+    "PhoneService": YES_NO,
+    "MultipleLines": ["Yes", "No", "No phone service"],
+    "InternetService": ["DSL", "Fiber optic", "No"],
+    "OnlineSecurity": INTERNET_ADDON,
+    "OnlineBackup": INTERNET_ADDON,
+    "DeviceProtection": INTERNET_ADDON,
+    "TechSupport": INTERNET_ADDON,
+    "StreamingTV": INTERNET_ADDON,
+    "StreamingMovies": INTERNET_ADDON,
+    "Contract": ["Month-to-month", "One year", "Two year"],
+    "PaperlessBilling": YES_NO,
+    "PaymentMethod": [
+        "Electronic check",
+        "Mailed check",
+        "Bank transfer (automatic)",
+        "Credit card (automatic)",
+    ],
+}
+
+
+def churn_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"customerID": [f"C{i:07d}" for i in range(n)]})
+
+    for col, values in TELCO_CATEGORIES.items():
+        df[col] = rng.choice(values, size=n)
+
+    df["SeniorCitizen"] = rng.integers(0, 2, size=n)
+    df["tenure"] = rng.integers(0, 73, size=n)
+    df["MonthlyCharges"] = rng.uniform(18, 120, size=n).round(2)
+
+    total = (df["tenure"] * df["MonthlyCharges"]).round(2).astype(str)
+    total[df["tenure"] == 0] = " "  # blank strings, as in the Kaggle file
+    df["TotalCharges"] = total
+
+    churn_logit = -1.0 + 1.2 * (df["Contract"] == "Month-to-month") - 0.03 * df["tenure"]
+    df["Churn"] = np.where(rng.random(n) < 1 / (1 + np.exp(-churn_logit)), "Yes", "No")
+    return df
+
+
+# ======================
+# FRAUD (feature_columns.pkl)
+# ======================
+# Built from the validation vocabulary so the two cannot drift apart.
+# Police_NoWitness is derived below; the "0" placeholder for a missing
+# claim date is left out, as it is rare in the real data.
+FRAUD_CATEGORIES = {
+    col: [v for v in values if v != "0"]
+    for col, values in fraud.VOCABULARY.items()
+    if col != "Police_NoWitness"
+}
+
+
+def fraud_frame(n, seed=0, feature_cols=None):
+    rng = np.random.default_rng(seed)
+    data = {}
+
+    for col, values in FRAUD_CATEGORIES.items():
+        data[col] = rng.choice(values, size=n)
+
+    data["Age"] = rng.integers(16, 81, size=n)
+    data["Police_NoWitness"] = (
+        (data["PoliceReportFiled"] == "No") & (data["WitnessPresent"] == "No")
+    ).astype(int)
+    data["FraudFound_P"] = (rng.random(n) < 0.06).astype(int)
+
+    df = pd.DataFrame(data)
+    if feature_cols is not None:
+        df = df[list(feature_cols) + ["FraudFound_P"]]
+    return df
+
+
+# ======================
+# DELIVERY
+# ======================
+DELIVERY_CATEGORIES = {
+    "Road_traffic_density": ["Low", "Medium", "High", "Jam"],
+    "Weather_conditions": ["Sunny", "Cloudy", "Fog", "Stormy", "Windy", "Sandstorms"],
+    "Festival": ["No", "Yes"],
+    "City": ["Urban", "Semi-Urban", "Metropolitan"],
+    "Type_of_vehicle": ["motorcycle", "scooter", "electric_scooter", "bicycle"],
+    "Type_of_order": ["Snack", "Meal", "Drinks", "Buffet"],
+}
+
+
+def delivery_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Distance_km": rng.uniform(0.1, 50.0, size=n).round(2),
+        "Order_Hour": rng.integers(0, 24, size=n),
+        "multiple_deliveries": rng.integers(0, 4, size=n),
+        "Delivery_person_Age": rng.integers(18, 61, size=n),
+        "Delivery_person_Ratings": rng.uniform(1.0, 5.0, size=n).round(1),
+        "Vehicle_condition": rng.integers(0, 3, size=n),
+    })
+
+    for col, values in DELIVERY_CATEGORIES.items():
+        df[col] = rng.choice(values, size=n)
+    return df
+
+
+DELIVERY_ARTIFACTS = ["scaler.pkl", "ohe_columns.pkl", "num_cols.pkl", "final_feature_columns.pkl"]
+
+
+def delivery_model(model_dir, rows=20_000, seed=0):
+    """Write a complete delivery artifact set to `model_dir`.
+
+    `xgb_model.pkl` is not in the repo, so an XGBRegressor is trained on
+    synthetic orders with the real feature layout; the scaler and column
+    lists are copied from `projects/models`.
+    """
+    import shutil
+    from pathlib import Path
+
+    import joblib
+    from xgboost import XGBRegressor
+
+    from utils import delivery
+
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    for name in DELIVERY_ARTIFACTS:
+        shutil.copy(delivery.MODEL_DIR / name, model_dir / name)
+
+    scaler = joblib.load(model_dir / "scaler.pkl")
+    num_cols = joblib.load(model_dir / "num_cols.pkl")
+    final_features = joblib.load(model_dir / "final_feature_columns.pkl")
+    df = delivery_frame(rows, seed)
+    X = delivery.prepare_features(df, scaler, num_cols, final_features)
+    y = df["Distance_km"] * 2 + df["Order_Hour"] * 0.3 + 15
+    model = XGBRegressor(n_estimators=300, max_depth=8).fit(X, y)
+    joblib.dump(model, delivery.model_path(model_dir, "pkl"))
+
+
+# ======================
+# E-COMMERCE (base_sales.csv / rfm_table.csv)
+# ======================
+RFM_SEGMENTS = ["Champions", "Loyal Customers", "Potential Loyalists",
+                "New Customers", "Promising", "Need Attention", "At Risk",
+                "Hibernating"]
+RFM_WEIGHTS = [0.01, 0.01, 0.01, 0.07, 0.24, 0.01, 0.02, 0.63]
+
+
+def sales_frames(n, seed=0, end="2024-01-21"):
+    """Return `(sales, rfm)` with `n` order lines."""
+    rng = np.random.default_rng(seed)
+    n_users = max(n // 3, 1)
+
+    end_ts = pd.Timestamp(end)
+    offsets = rng.integers(0, 2 * 365 * 24 * 3600, size=n)
+    sales = pd.DataFrame({
+        "order_id": rng.integers(0, max(n // 2, 1), size=n),
+        "user_id": rng.integers(0, n_users, size=n),
+        "created_at": end_ts - pd.to_timedelta(offsets, unit="s"),
+        "sale_price": rng.gamma(2.0, 30.0, size=n).round(2),
+        "margin_pct": rng.uniform(0.3, 0.6, size=n),
+    })
+
+    rfm = (
+        sales.groupby("user_id")
+        .agg(
+            last_order_date=("created_at", "max"),
+            frequency=("order_id", "nunique"),
+            monetary=("sale_price", "sum"),
+        )
+        .reset_index()
+    )
+    rfm["recency_days"] = (end_ts - rfm["last_order_date"]).dt.days
+    rfm["last_order_date"] = rfm["last_order_date"].dt.date
+    for score, col in [("r_score", "recency_days"), ("f_score", "frequency"),
+                       ("m_score", "monetary")]:
+        rfm[score] = pd.qcut(rfm[col].rank(method="first"), 5, labels=False) + 1
+    rfm["r_score"] = 6 - rfm["r_score"]
+    rfm["rfm_score"] = (rfm["r_score"].astype(str) + rfm["f_score"].astype(str)
+                        + rfm["m_score"].astype(str))
+    rfm["score"] = rfm[["r_score", "f_score", "m_score"]].sum(axis=1)
+    rfm["rfm_segment"] = rng.choice(RFM_SEGMENTS, size=len(rfm), p=RFM_WEIGHTS)
+
+    return sales, rfm
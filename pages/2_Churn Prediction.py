@@ -2,12 +2,10 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 
-from sklearn.model_selection import train_test_split
-from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
-from sklearn.pipeline import Pipeline
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+from utils.inference import get_scheduler
+from utils.profiling import Profiler
+from utils.session_store import render_memory_view, session_store
+from utils.upload_store import read_upload, render_upload_stats
 
 
 # ================================
@@ -19,6 +17,12 @@ st.set_page_config(
     layout="wide"
 )
 
+prof = Profiler("churn")
+store = session_store()
+if prof.enabled:
+    render_memory_view()
+    render_upload_stats()
+
 st.title("📉 Customer Churn Prediction")
 st.markdown(
     """
@@ -46,7 +50,10 @@ if uploaded_file is None:
     st.info("⬅️ Upload a CSV file to start (e.g. Kaggle Telco Customer Churn dataset).")
     st.stop()
 
-df = pd.read_csv(uploaded_file)
+with prof.stage("read_csv") as s:
+    # Identical bytes (refresh, or same file on another page) skip parsing
+    df, _ = read_upload(uploaded_file)
+    s.rows = len(df)
 
 st.success("Dataset loaded successfully!")
 
@@ -66,50 +73,52 @@ target_col = st.selectbox(
 # ------------------------------------------------
 # Basic cleaning (Telco-specific)
 # ------------------------------------------------
-df = df.copy()
+with prof.stage("clean", rows=len(df)):
+    df = df.copy()
 
-if "TotalCharges" in df.columns:
-    df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce")
+    if "TotalCharges" in df.columns:
+        df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce")
 
-df = df.dropna(subset=[target_col])
+    df = df.dropna(subset=[target_col])
 
-# Target → binary 0/1
-y_raw = df[target_col].astype(str).str.lower().str.strip()
+    # Target → binary 0/1
+    y_raw = df[target_col].astype(str).str.lower().str.strip()
 
-if set(y_raw.unique()) <= {"yes", "no"}:
-    y = (y_raw == "yes").astype(int)
-else:
-    y_num = pd.to_numeric(df[target_col], errors="coerce")
-    if len(set(y_num.unique())) != 2:
-        st.error("Target column must be binary (Yes/No or 0/1).")
-        st.stop()
-    vals = sorted(list(set(y_num.unique())))
-    y = (y_num == vals[1]).astype(int)
+    if set(y_raw.unique()) <= {"yes", "no"}:
+        y = (y_raw == "yes").astype(int)
+    else:
+        y_num = pd.to_numeric(df[target_col], errors="coerce")
+        if len(set(y_num.unique())) != 2:
+            st.error("Target column must be binary (Yes/No or 0/1).")
+            st.stop()
+        vals = sorted(list(set(y_num.unique())))
+        y = (y_num == vals[1]).astype(int)
 
-X = df.drop(columns=[target_col])
+    X = df.drop(columns=[target_col])
 
-# Drop ID columns
-for col in ["customerID", "CustomerID", "ID", "id", "customer_id"]:
-    if col in X.columns:
-        X = X.drop(columns=[col])
+    # Drop ID columns
+    for col in ["customerID", "CustomerID", "ID", "id", "customer_id"]:
+        if col in X.columns:
+            X = X.drop(columns=[col])
 
 # ------------------------------------------------
 # Feature detection
 # ------------------------------------------------
-numeric_features = X.select_dtypes(
-    include=["int64", "float64"]
-).columns.tolist()
+with prof.stage("feature_detection", rows=len(X)):
+    numeric_features = X.select_dtypes(
+        include=["int64", "float64"]
+    ).columns.tolist()
 
-categorical_features = [
-    c for c in X.columns if c not in numeric_features
-]
+    categorical_features = [
+        c for c in X.columns if c not in numeric_features
+    ]
 
-# Fill missing values
-for c in numeric_features:
-    X[c] = X[c].fillna(X[c].median())
+    # Fill missing values
+    for c in numeric_features:
+        X[c] = X[c].fillna(X[c].median())
 
-for c in categorical_features:
-    X[c] = X[c].fillna("Unknown")
+    for c in categorical_features:
+        X[c] = X[c].fillna("Unknown")
 
 st.subheader("3️⃣ Feature Overview")
 
@@ -132,11 +141,25 @@ random_state = st.number_input("Random state", 0, 9999, 42)
 
 train_button = st.button("🚀 Train Logistic Regression Model", type="primary")
 
-if train_button:
+
+# Bounded so every distinct upload/setting does not keep a fitted pipeline
+# for the life of the process; sessions keep their own in session_state.
+@st.cache_resource(show_spinner="Training model...", max_entries=8, ttl=3600)
+def train_model(X, y, numeric_features, categorical_features, test_size, random_state):
+    # Cached across sessions: identical data + settings share one pipeline,
+    # so their single-row predictions can be batched together.
+    # sklearn is imported here to keep it off the cold start.
+    from sklearn.model_selection import train_test_split
+    from sklearn.compose import ColumnTransformer
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+    from sklearn.pipeline import Pipeline
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+
     X_train, X_test, y_train, y_test = train_test_split(
         X, y,
         test_size=test_size,
-        random_state=int(random_state),
+        random_state=random_state,
         stratify=y
     )
 
@@ -161,17 +184,32 @@ if train_button:
     y_pred = pipeline.predict(X_test)
     y_proba = pipeline.predict_proba(X_test)[:, 1]
 
+    scores = {
+        "Accuracy": accuracy_score(y_test, y_pred),
+        "F1-Score": f1_score(y_test, y_pred),
+        "ROC-AUC": roc_auc_score(y_test, y_proba),
+    }
+    return pipeline, scores
+
+
+if train_button:
+    with prof.stage("train", rows=len(X)):
+        pipeline, scores = train_model(
+            X, y, numeric_features, categorical_features,
+            test_size, int(random_state)
+        )
+
     st.success("✅ Model training completed")
 
     m1, m2, m3 = st.columns(3)
-    m1.metric("Accuracy", f"{accuracy_score(y_test, y_pred):.3f}")
-    m2.metric("F1-Score", f"{f1_score(y_test, y_pred):.3f}")
-    m3.metric("ROC-AUC", f"{roc_auc_score(y_test, y_proba):.3f}")
+    m1.metric("Accuracy", f"{scores['Accuracy']:.3f}")
+    m2.metric("F1-Score", f"{scores['F1-Score']:.3f}")
+    m3.metric("ROC-AUC", f"{scores['ROC-AUC']:.3f}")
 
-    # Save to session
+    # Save to session (the training frame goes through the budgeted store)
     st.session_state["pipeline"] = pipeline
     st.session_state["X_columns"] = X.columns.tolist()
-    st.session_state["X_ref"] = X
+    store["X_ref"] = X
     st.session_state["num_feats"] = numeric_features
     st.session_state["cat_feats"] = categorical_features
 
@@ -182,13 +220,13 @@ st.divider()
 # ------------------------------------------------
 st.subheader("5️⃣ Predict Churn for a New Customer")
 
-if "pipeline" not in st.session_state:
+if "pipeline" not in st.session_state or "X_ref" not in store:
     st.info("Train the model first to enable prediction.")
     st.stop()
 
 pipeline = st.session_state["pipeline"]
 X_cols = st.session_state["X_columns"]
-X_ref = st.session_state["X_ref"]
+X_ref = store["X_ref"]
 num_feats = st.session_state["num_feats"]
 cat_feats = st.session_state["cat_feats"]
 
@@ -206,12 +244,18 @@ with st.form("prediction_form"):
     submit = st.form_submit_button("🔮 Predict Churn")
 
 if submit:
-    input_df = pd.DataFrame([inputs])
-    prob = pipeline.predict_proba(input_df)[:, 1][0]
+    with prof.stage("predict_single", rows=1):
+        input_df = pd.DataFrame([inputs])
+        # Batched with other sessions' requests on the same pipeline
+        prob = get_scheduler(pipeline, "predict_proba").predict(input_df)[0, 1]
     pred = int(prob >= 0.5)
 
     st.write(f"**Churn Probability:** `{prob:.3f}`")
     st.write(
         "**Prediction:** "
         + ("❌ Likely to Churn" if pred == 1 else "✅ Likely to Stay")
-    )
\ No newline at end of file
+    )
+
+    if prof.enabled:
+        with st.sidebar.expander("Inference scheduler"):
+            st.json(get_scheduler(pipeline, "predict_proba").metrics())
\ No newline at end of file
@@ -1,9 +1,14 @@
+import io
+
 import streamlit as st
-import pandas as pd
-import joblib
-from catboost import CatBoostClassifier
 from pathlib import Path
 
+from utils import fraud
+from utils.schema import ValidationError
+from utils.profiling import Profiler
+from utils.session_store import render_memory_view, session_store
+from utils.upload_store import read_upload, render_upload_stats
+
 # ===============================
 # Page Config
 # ===============================
@@ -13,6 +18,12 @@ st.set_page_config(
     layout="wide"
 )
 
+prof = Profiler("fraud")
+store = session_store()
+if prof.enabled:
+    render_memory_view()
+    render_upload_stats()
+
 st.title("🚗 Insurance Claim Fraud Risk Prediction")
 st.markdown("""
 This application predicts **fraud risk probability** for insurance claims  
@@ -26,16 +37,8 @@ st.divider()
 # ===============================
 @st.cache_resource
 def load_artifacts():
-    model = CatBoostClassifier()
-    model.load_model("projects/models/model_cat.cbm")
-
-    feature_cols = joblib.load("projects/models/feature_columns.pkl")
-    threshold = joblib.load("projects/models/best_threshold.pkl")
-
-    return model, feature_cols, threshold
-
+    return fraud.load_artifacts()
 
-model, FEATURE_COLS, BEST_THRESHOLD = load_artifacts()
 
 # ===============================
 # Upload Data
@@ -44,7 +47,27 @@ st.subheader("📤 Upload Dataset")
 uploaded_file = st.file_uploader("Upload CSV file", type=["csv"])
 
 if uploaded_file is not None:
-    df = pd.read_csv(uploaded_file)
+    # Model is loaded on the first upload, not on page open
+    with prof.stage("load_artifacts"):
+        model, FEATURE_COLS, BEST_THRESHOLD = load_artifacts()
+
+    # ===============================
+    # READ (FAIL FAST ON A PREFIX)
+    # ===============================
+    def check_prefix(data):
+        with prof.stage("validate_prefix", rows=fraud.PREFIX_ROWS):
+            fraud.validate_prefix(io.BytesIO(data), FEATURE_COLS)
+
+    try:
+        with prof.stage("read_csv") as s:
+            # Identical bytes (refresh, or same file on another page) skip
+            # parsing; new bytes get their first rows checked before parsing
+            df, upload_id = read_upload(uploaded_file, on_miss=check_prefix)
+            s.rows = len(df)
+    except ValidationError as exc:
+        st.error(str(exc))
+        st.dataframe(exc.report.to_frame(), hide_index=True, use_container_width=True)
+        st.stop()
 
     st.success("Data uploaded successfully!")
     st.write("Preview of uploaded data:")
@@ -54,62 +77,121 @@ if uploaded_file is not None:
     # CLEANING (WAJIB)
     # ===============================
 
-    # 1. Drop unnamed index column
-    df = df.loc[:, ~df.columns.str.contains("^Unnamed")]
-
-    # 2. Drop target if exists
-    TARGET_COL = "FraudFound_P"
-    if TARGET_COL in df.columns:
-        df = df.drop(columns=[TARGET_COL])
+    # Drop unnamed index column and target if exists
+    df = fraud.clean(df)
 
     # ===============================
     # REORDER COLUMNS (PALING PENTING)
     # ===============================
-    missing_cols = set(FEATURE_COLS) - set(df.columns)
+    missing_cols = fraud.missing_columns(df, FEATURE_COLS)
     if missing_cols:
         st.error(f"Missing required columns: {missing_cols}")
         st.stop()
 
-    df = df[FEATURE_COLS]
-
     # ===============================
-    # TYPE CASTING
+    # VALIDATION & TYPE CASTING
     # ===============================
-    NUMERIC_FEATURES = ["Age"]
-    CATEGORICAL_FEATURES = [c for c in FEATURE_COLS if c not in NUMERIC_FEATURES]
+    with prof.stage("validate_and_cast", rows=len(df)):
+        df, report = fraud.validate_features(df, FEATURE_COLS)
 
-    # numeric
-    for col in NUMERIC_FEATURES:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+    with st.expander(f"🧾 Validation report: {report.summary()}", expanded=report.has_errors):
+        if report.counts:
+            st.dataframe(report.to_frame(), hide_index=True, use_container_width=True)
+        else:
+            st.write("No issues found.")
 
-    # categorical
-    for col in CATEGORICAL_FEATURES:
-        df[col] = df[col].astype(str)
+    if report.error_rate > fraud.MAX_ERROR_RATE:
+        st.error("Too many invalid rows to score this file, see the validation report.")
+        st.stop()
 
     st.subheader("🧪 Feature Processing Summary")
-    st.write("Numeric features:", NUMERIC_FEATURES)
-    st.write("Categorical features:", CATEGORICAL_FEATURES)
+    st.write("Numeric features:", fraud.NUMERIC_FEATURES)
+    st.write("Categorical features:", fraud.categorical_features(FEATURE_COLS))
 
     # ===============================
     # PREDICTION
     # ===============================
     st.subheader("🔍 Fraud Risk Scoring")
 
-    fraud_prob = model.predict_proba(df)[:, 1]
-    fraud_pred = (fraud_prob >= BEST_THRESHOLD).astype(int)
-
-    df_result = df.copy()
-    df_result["Fraud_Probability"] = fraud_prob
-    df_result["Fraud_Prediction"] = fraud_pred
+    # Reruns on the same upload (e.g. the download click) reuse the scores
+    if (store.get("fraud_upload_id") == upload_id
+            and "fraud_result" in store and "fraud_summary" in store):
+        df_result = store["fraud_result"]
+        summary = store["fraud_summary"]
+    else:
+        # Scored in chunks; the distribution summary is built as they finish
+        summary = fraud.new_summary(FEATURE_COLS, BEST_THRESHOLD)
+        with prof.stage("predict_proba", rows=len(df)):
+            fraud_prob, fraud_pred = fraud.score_chunks(model, df, BEST_THRESHOLD, summary)
+
+        df_result = df.copy()
+        df_result["Fraud_Probability"] = fraud_prob
+        df_result["Fraud_Prediction"] = fraud_pred
+
+        store["fraud_upload_id"] = upload_id
+        store["fraud_result"] = df_result
+        store["fraud_summary"] = summary
 
     st.success("Prediction completed!")
     st.write(f"Threshold used: **{BEST_THRESHOLD:.3f}**")
     st.dataframe(df_result.head(10))
 
+    # ===============================
+    # Score Distribution
+    # ===============================
+    st.subheader("📊 Score Distribution")
+
+    p50, p90, p99 = summary.quantiles([0.5, 0.9, 0.99])
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Claims Scored", f"{summary.rows:,}")
+    m2.metric("Flagged as Fraud", f"{summary.flagged:,}", f"{summary.flag_rate:.1%} of claims",
+              delta_color="off")
+    m3.metric("Median Probability", f"{p50:.3f}")
+    m4.metric("P90 / P99 Probability", f"{p90:.3f} / {p99:.3f}")
+
+    import plotly.express as px
+
+    hist = summary.histogram.to_frame()
+    hist["probability"] = (hist["low"] + hist["high"]) / 2
+    fig_hist = px.bar(
+        hist,
+        x="probability",
+        y="count",
+        labels={"probability": "Fraud Probability", "count": "Claims"},
+        title="Fraud Probability Distribution",
+    )
+    fig_hist.update_traces(width=(hist["high"] - hist["low"]).iloc[0])
+    fig_hist.add_vline(x=BEST_THRESHOLD, line_dash="dash", annotation_text="threshold")
+
+    with prof.stage("plotly_hist"):
+        st.plotly_chart(fig_hist, use_container_width=True)
+
+    columns = summary.categories.columns
+    breakdown_col = st.selectbox(
+        "Break down flagged rate by",
+        columns,
+        index=columns.index("PolicyType") if "PolicyType" in columns else 0,
+    )
+    breakdown = summary.breakdown(breakdown_col)
+    fig_breakdown = px.bar(
+        breakdown,
+        x="value",
+        y="flag_rate",
+        hover_data=["rows", "flagged"],
+        labels={"value": breakdown_col, "flag_rate": "Flagged Rate"},
+        title=f"Flagged Rate by {breakdown_col}",
+    )
+    fig_breakdown.update_yaxes(tickformat=".0%")
+    fig_breakdown.add_hline(y=summary.flag_rate, line_dash="dot", annotation_text="overall")
+
+    with prof.stage("plotly_breakdown"):
+        st.plotly_chart(fig_breakdown, use_container_width=True)
+
     # ===============================
     # Download
     # ===============================
-    csv = df_result.to_csv(index=False).encode("utf-8")
+    with prof.stage("to_csv", rows=len(df_result)):
+        csv = df_result.to_csv(index=False).encode("utf-8")
     st.download_button(
         "⬇️ Download Prediction Result",
         csv,
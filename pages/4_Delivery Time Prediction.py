@@ -1,7 +1,10 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import joblib
+
+from utils import delivery
+from utils.inference import get_scheduler
+from utils.profiling import Profiler
 
 st.set_page_config(
     page_title="Food Delivery Time Prediction",
@@ -9,16 +12,12 @@ st.set_page_config(
     layout="wide"
 )
 
+prof = Profiler("delivery")
+
 @st.cache_resource
 def load_artifacts():
-    from xgboost import XGBRegressor 
-    
-    model = joblib.load("projects/models/xgb_model.pkl")
-    scaler = joblib.load("projects/models/scaler.pkl")
-    ohe_columns = joblib.load("projects/models/ohe_columns.pkl")
-    return model, scaler, ohe_columns
-
-model, scaler, ohe_columns = load_artifacts()
+    # Heavy imports stay inside: the page renders its inputs before any model loads
+    return delivery.load_artifacts()
 
 st.header("🍔 Delivery Time Prediction")
 st.write("Estimate food delivery time based on order conditions")
@@ -64,27 +63,26 @@ input_df = pd.DataFrame([{
 }])
 
 # ======================
-# PREPROCESSING
-# ======================
-# Scale numerical
-num_cols = joblib.load("projects/models/num_cols.pkl")
-
-input_df[num_cols] = scaler.transform(input_df[num_cols])
-
-final_features = joblib.load("projects/models/final_feature_columns.pkl")
-
-# One-hot encode categorical
-input_encoded = pd.get_dummies(input_df, drop_first=True)
-
-# Align with training columns
-input_final = input_encoded.reindex(
-    columns=final_features,
-    fill_value=0
-)
-
-# ======================
-# PREDICTION
+# PREPROCESSING & PREDICTION
 # ======================
 if st.button("Predict Delivery Time"):
-    prediction = model.predict(input_final)[0]
+    with prof.stage("load_artifacts"):
+        try:
+            model, scaler, ohe_columns, num_cols, final_features = load_artifacts()
+        except FileNotFoundError as exc:
+            st.error(f"Delivery model is not available: {exc}")
+            st.stop()
+
+    with prof.stage("preprocess", rows=len(input_df)):
+        input_final = delivery.prepare_features(
+            input_df, scaler, num_cols, final_features
+        )
+
+    with prof.stage("predict", rows=len(input_final)):
+        # Batched with other sessions' requests on the shared model
+        prediction = get_scheduler(model, "predict").predict(input_final)[0]
     st.success(f"Estimated Delivery Time: {prediction:.1f} minutes")
+
+    if prof.enabled:
+        with st.sidebar.expander("Inference scheduler"):
+            st.json(get_scheduler(model, "predict").metrics())
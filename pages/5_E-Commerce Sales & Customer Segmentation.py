@@ -1,11 +1,15 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import numpy as np
 from pathlib import Path
 
+from utils.profiling import Profiler
+from utils.retention import build_strata, simulate_retention
+
 st.set_page_config(layout="wide", page_title="E-Commerce Analytics")
 
+prof = Profiler("ecommerce")
+
 st.markdown("""
 <style>
 
@@ -68,16 +72,22 @@ def load_data():
     sales = pd.read_csv(sales_path, parse_dates=["created_at"])
     rfm   = pd.read_csv(rfm_path)
 
-    return sales, rfm
+    # Built once with the data, so slider reruns hash only the small strata
+    strata = build_strata(rfm)
 
-sales, rfm = load_data()
+    return sales, rfm, strata
+
+with prof.stage("load_data") as s:
+    sales, rfm, strata = load_data()
+    s.rows = len(sales)
 
 # ======================
 # FILTER LAST 1 YEAR
 # ======================
 max_date = sales["created_at"].max()
 one_year_ago = max_date - pd.DateOffset(years=1)
-sales_1y = sales[sales["created_at"] >= one_year_ago]
+with prof.stage("filter_1y", rows=len(sales)):
+    sales_1y = sales[sales["created_at"] >= one_year_ago]
 
 # ======================
 # TITLE
@@ -124,9 +134,14 @@ st.markdown("<div class='section-divider'></div>", unsafe_allow_html=True)
 # ======================
 # REVENUE TREND
 # ======================
+# Streamlit already imports plotly; plotly.express (~50ms more) is
+# imported after the KPI cards so they paint first
+import plotly.express as px
+
 sales_1y["order_month"] = sales_1y["created_at"].dt.to_period("M").astype(str)
 
-monthly = sales_1y.groupby("order_month")["sale_price"].sum().reset_index()
+with prof.stage("monthly_groupby", rows=len(sales_1y)):
+    monthly = sales_1y.groupby("order_month")["sale_price"].sum().reset_index()
 
 fig_trend = px.line(monthly, x="order_month", y="sale_price")
 
@@ -139,7 +154,8 @@ fig_trend.update_layout(
 
 fig_trend.update_traces(line=dict(color="#1F3C88", width=3))
 
-st.plotly_chart(fig_trend, use_container_width=True)
+with prof.stage("plotly_trend"):
+    st.plotly_chart(fig_trend, use_container_width=True)
 
 st.markdown("<div class='section-divider'></div>", unsafe_allow_html=True)
 
@@ -164,25 +180,27 @@ fig_pie.update_layout(
     paper_bgcolor="white"
 )
 
-st.plotly_chart(fig_pie, use_container_width=True)
+with prof.stage("plotly_pie"):
+    st.plotly_chart(fig_pie, use_container_width=True)
 
 st.markdown("<div class='section-divider'></div>", unsafe_allow_html=True)
 
 # ======================
 # REVENUE BY SEGMENT
 # ======================
-merged = sales_1y.merge(
-    rfm[["user_id", "rfm_segment"]],
-    on="user_id",
-    how="left"
-)
-
-segment_rev = (
-    merged.groupby("rfm_segment")["sale_price"]
-    .sum()
-    .reset_index()
-    .sort_values("sale_price", ascending=False)
-)
+with prof.stage("segment_revenue", rows=len(sales_1y)):
+    merged = sales_1y.merge(
+        rfm[["user_id", "rfm_segment"]],
+        on="user_id",
+        how="left"
+    )
+
+    segment_rev = (
+        merged.groupby("rfm_segment")["sale_price"]
+        .sum()
+        .reset_index()
+        .sort_values("sale_price", ascending=False)
+    )
 
 fig_bar = px.bar(
     segment_rev,
@@ -198,7 +216,8 @@ fig_bar.update_layout(
 
 fig_bar.update_traces(marker_color="#1F3C88")
 
-st.plotly_chart(fig_bar, use_container_width=True)
+with prof.stage("plotly_bar"):
+    st.plotly_chart(fig_bar, use_container_width=True)
 
 st.markdown("<div class='section-divider'></div>", unsafe_allow_html=True)
 
@@ -207,30 +226,51 @@ st.markdown("<div class='section-divider'></div>", unsafe_allow_html=True)
 # ======================
 st.subheader("Retention Impact Simulation")
 
-hib_rev = segment_rev.loc[
-    segment_rev["rfm_segment"] == "Hibernating",
-    "sale_price"
-]
-
-hib_rev = hib_rev.values[0] if len(hib_rev) > 0 else 0
+@st.cache_data
+def run_simulation(strata, reactivation_rate, repeat_uplift):
+    return simulate_retention(strata, reactivation_rate, repeat_uplift)
 
 reactivation = st.slider("Reactivation Rate (%)", 0, 30, 10)
 repeat_uplift = st.slider("Repeat Purchase Increase (%)", 0, 20, 10)
 
-reactivation_gain = hib_rev * (reactivation / 100)
-repeat_gain = total_revenue * (repeat_uplift / 100)
-total_gain = reactivation_gain + repeat_gain
+with prof.stage("retention_simulation"):
+    bands, totals = run_simulation(strata, reactivation / 100, repeat_uplift / 100)
+
+def band_text(values):
+    p5, p50, p95 = np.percentile(values, [5, 50, 95])
+    return f"${p50:,.0f}<br><span class='metric-title'>90% CI ${p5:,.0f} – ${p95:,.0f}</span>"
 
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    metric_card("Reactivation Potential", f"${reactivation_gain:,.0f}")
+    metric_card("Reactivation Potential", band_text(totals["reactivation"]))
 
 with col2:
-    metric_card("Repeat Purchase Uplift", f"${repeat_gain:,.0f}")
+    metric_card("Repeat Purchase Uplift", band_text(totals["repeat"]))
 
 with col3:
-    metric_card("Total Revenue Impact", f"${total_gain:,.0f}")
+    metric_card("Total Revenue Impact", band_text(totals["total"]))
+
+fig_sim = px.bar(
+    bands,
+    x="P50",
+    y="Segment",
+    orientation="h",
+    error_x=bands["P95"] - bands["P50"],
+    error_x_minus=bands["P50"] - bands["P5"],
+)
+
+fig_sim.update_layout(
+    plot_bgcolor="white",
+    paper_bgcolor="white",
+    xaxis_title="Incremental revenue (median, 5th–95th percentile)",
+    yaxis=dict(autorange="reversed"),
+)
+
+fig_sim.update_traces(marker_color="#1F3C88")
+
+with prof.stage("plotly_sim"):
+    st.plotly_chart(fig_sim, use_container_width=True)
 
 st.markdown(
 """
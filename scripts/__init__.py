@@ -0,0 +1 @@
+"""Offline command-line tools that reuse the page logic outside Streamlit."""
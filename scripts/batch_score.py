@@ -0,0 +1,257 @@
+"""Offline multi-process batch scoring for the fraud and delivery models.
+
+Scores a directory of CSV files (or one large file split into chunks)
+across a process pool, reusing the exact cleaning and feature alignment of
+the Streamlit pages (`utils.fraud`, `utils.delivery`). Each worker loads
+the model once at start-up. For fraud, every chunk also returns a
+`ScoreSummary` (quantiles, histogram, flag counts per category) and a
+validation report, merged into the JSON report. Each fraud file's first
+rows are validated before anything is scored, and chunks over the error
+limit are skipped and listed rather than aborting the run.
+
+    python -m scripts.batch_score fraud data/claims/ --out scored/
+    python -m scripts.batch_score delivery orders.csv --chunksize 200000 \\
+        --workers 8 --format parquet --out scored/
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import pandas as pd
+
+from utils import delivery, fraud
+from utils.schema import ValidationError, ValidationReport
+
+MODELS = {"fraud": fraud, "delivery": delivery}
+
+# Per-process state, filled once by _init_worker
+_WORKER = {}
+
+
+def _init_worker(kind, model_dir, threads):
+    # N workers x `threads` stays within the machine's cores; the limit is
+    # passed to CatBoost (thread_count) and xgboost (nthread) explicitly
+    artifacts = MODELS[kind].load_artifacts(model_dir)
+    if kind == "fraud":
+        model, feature_cols, threshold = artifacts
+
+        def score(df):
+            summary = fraud.new_summary(feature_cols, threshold)
+            result, report = fraud.score_frame(
+                df, model, feature_cols, threshold, thread_count=threads,
+                summary=summary,
+            )
+            return result, summary, report
+
+        _WORKER["score"] = score
+    else:
+        model, scaler, _, num_cols, final_features = artifacts
+        delivery.set_threads(model, threads)
+        _WORKER["score"] = lambda df: (
+            delivery.score_frame(df, model, scaler, num_cols, final_features),
+            None,
+            None,
+        )
+
+
+def _write(df, path, fmt):
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def _score_task(source, out_path, fmt):
+    """Score a chunk, or a whole file given by path (parsed in the worker).
+
+    Returns `(rows, busy_s, summary, report)`; `rows` is None when the
+    chunk failed validation and nothing was written.
+    """
+    start = time.perf_counter()
+    df = source if isinstance(source, pd.DataFrame) else pd.read_csv(source)
+    try:
+        result, summary, report = _WORKER["score"](df)
+    except ValidationError as exc:
+        return None, time.perf_counter() - start, None, exc.report
+    _write(result, out_path, fmt)
+    return len(result), time.perf_counter() - start, summary, report
+
+
+def _input_files(inputs):
+    files = []
+    for item in map(Path, inputs):
+        if item.is_dir():
+            files.extend(sorted(item.glob("*.csv")))
+        else:
+            files.append(item)
+    return files
+
+
+def _tasks(files, out_dir, fmt, chunksize):
+    """Yield `(source, DataFrame or path, output path)`, one per file or chunk.
+
+    Whole files are handed over by path so workers parse them in parallel;
+    only `--chunksize` splitting reads in this process.
+    """
+    for src in files:
+        if chunksize:
+            for i, chunk in enumerate(pd.read_csv(src, chunksize=chunksize)):
+                yield src, chunk, out_dir / f"{src.stem}.part{i:05d}.{fmt}"
+        else:
+            yield src, src, out_dir / f"{src.stem}.scored.{fmt}"
+
+
+def run(kind, inputs, out_dir, fmt="csv", workers=None, chunksize=None,
+        model_dir=None, threads=None):
+    files = _input_files(inputs)
+    if not files:
+        raise SystemExit("No input CSV files found.")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow: pip install pyarrow")
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cpus = os.cpu_count() or 1
+    workers = workers or cpus
+    threads = threads or max(1, cpus // workers)
+    model_dir = model_dir or MODELS[kind].MODEL_DIR
+
+    if kind == "fraud":
+        # Fail fast, before any output is written, on files that are
+        # clearly malformed
+        feature_cols = fraud.load_feature_columns(model_dir)
+        for src in files:
+            try:
+                fraud.validate_prefix(src, feature_cols)
+            except ValidationError as exc:
+                raise SystemExit(f"{src}: {exc}\n{exc.report.to_frame().to_string(index=False)}")
+
+    per_file = {
+        str(f): {"rows": 0, "busy_s": 0.0, "parts": 0, "rejected_parts": [], "errors": []}
+        for f in files
+    }
+    reports = {str(f): ValidationReport() for f in files}
+    merged = None
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(kind, str(model_dir), threads),
+    ) as pool:
+        # Bound in-flight chunks so a huge file never sits fully in memory
+        max_pending = workers * 2
+        pending = {}
+
+        def drain(return_when):
+            nonlocal merged
+            done, _ = wait(pending, return_when=return_when)
+            for fut in done:
+                src, out_path = pending.pop(fut)
+                stats = per_file[src]
+                try:
+                    rows, busy, summary, report = fut.result()
+                except Exception as exc:
+                    # Keep going; the failure is reported against its file
+                    stats["errors"].append(f"{out_path.name}: {type(exc).__name__}: {exc}")
+                    continue
+                if report is not None:
+                    reports[src].merge(report)
+                if rows is None:
+                    stats["rejected_parts"].append(out_path.name)
+                    continue
+                if summary is not None:
+                    # Merge as results arrive; chunk summaries are small
+                    merged = summary if merged is None else merged.merge(summary)
+                stats["rows"] += rows
+                stats["busy_s"] = round(stats["busy_s"] + busy, 3)
+                stats["parts"] += 1
+
+        for src, data, out_path in _tasks(files, out_dir, fmt, chunksize):
+            if len(pending) >= max_pending:
+                drain(FIRST_COMPLETED)
+            pending[pool.submit(_score_task, data, out_path, fmt)] = (str(src), out_path)
+        if pending:
+            drain(ALL_COMPLETED)
+
+    elapsed = time.perf_counter() - start
+    total_rows = sum(s["rows"] for s in per_file.values())
+    validation = None
+    if kind == "fraud":
+        validation = ValidationReport()
+        for src, report in reports.items():
+            per_file[src]["validation"] = report.summary()
+            validation.merge(report)
+        validation = validation.to_dict()
+    return {
+        "model": kind,
+        "workers": workers,
+        "threads": threads,
+        "chunksize": chunksize,
+        "format": fmt,
+        "rows": total_rows,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_sec": round(total_rows / elapsed, 1) if elapsed else None,
+        "files": per_file,
+        "score_summary": merged.to_dict() if merged is not None else None,
+        "validation": validation,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("model", choices=list(MODELS))
+    parser.add_argument("inputs", nargs="+", help="CSV files or directories of CSV files")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--workers", type=int, help="processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, help="split inputs into chunks of N rows")
+    parser.add_argument(
+        "--threads", type=int, help="model threads per worker (default: CPU count / workers)"
+    )
+    parser.add_argument("--model-dir", help="artifact directory (default: projects/models)")
+    parser.add_argument("--report", help="write the throughput and validation report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(
+        args.model, args.inputs, args.out, fmt=args.format, workers=args.workers,
+        chunksize=args.chunksize, model_dir=args.model_dir, threads=args.threads,
+    )
+
+    failed = False
+    for name, stats in report["files"].items():
+        print(f"{name}: {stats['rows']:,} rows in {stats['parts']} part(s)")
+        if "validation" in stats:
+            print(f"  validation: {stats['validation']}")
+        if stats["rejected_parts"]:
+            print(f"  rejected (over the error limit): {', '.join(stats['rejected_parts'])}")
+        for error in stats["errors"]:
+            print(f"  failed: {error}")
+        failed = failed or stats["rejected_parts"] or stats["errors"]
+    print(
+        f"Scored {report['rows']:,} rows in {report['elapsed_s']:.2f}s "
+        f"({report['rows_per_sec']:,.0f} rows/s, {report['workers']} workers x {report['threads']} threads)"
+    )
+    summary = report["score_summary"]
+    if summary:
+        q = summary["quantiles"]
+        print(
+            f"Flagged {summary['flagged']:,} ({summary['flag_rate']:.2%}); "
+            f"score p50 {q['0.5']:.3f}, p95 {q['0.95']:.3f}, p99 {q['0.99']:.3f}"
+        )
+
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2))
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""One-time conversion of the delivery model pickle to a native booster file.
+
+Reads `xgb_model.pkl` (a joblib-pickled `XGBRegressor`), writes its booster
+as `xgb_model.ubj` (or `.json`) next to it and checks that both give the
+same predictions. `utils.delivery.load_model` picks the booster file up
+from then on; the pickle can stay as a fallback.
+
+    python -m scripts.convert_delivery_model
+    python -m scripts.convert_delivery_model --format json --model-dir path/to/models
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from utils import delivery
+
+PARITY_ROWS = 1_000
+TOLERANCE = 1e-5
+
+
+def convert(model_dir=delivery.MODEL_DIR, fmt="ubj"):
+    """Write the booster file; return `(path, max_abs_diff)` on random rows."""
+    model = delivery.load_model(model_dir, fmt="pkl")
+    booster = model.get_booster()
+    path = delivery.model_path(model_dir, fmt)
+    booster.save_model(str(path))
+
+    converted = delivery.load_model(model_dir, fmt=fmt)
+    X = np.random.default_rng(0).random((PARITY_ROWS, booster.num_features()), dtype=np.float32)
+    expected = model.predict(pd.DataFrame(X, columns=booster.feature_names))
+    diff = float(np.abs(expected - converted.predict(X)).max())
+    return path, diff
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--format", choices=["ubj", "json"], default="ubj")
+    parser.add_argument("--model-dir", default=str(delivery.MODEL_DIR))
+    args = parser.parse_args(argv)
+
+    try:
+        path, diff = convert(args.model_dir, args.format)
+    except FileNotFoundError as exc:
+        raise SystemExit(str(exc))
+
+    print(f"Wrote {path} ({path.stat().st_size / 1024:,.0f} KB)")
+    print(f"Max prediction difference on {PARITY_ROWS:,} random rows: {diff:.2e}")
+    if diff > TOLERANCE:
+        path.unlink()
+        raise SystemExit("Converted model does not match the pickle; booster file removed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Static assets decoded once per process.
+
+`load_image` resizes an image to its display width and re-encodes it as
+WebP. The encoded bytes are cached process-wide and also written next to
+the source under `assets/.cache/`, so a restarted container only reads a
+small file instead of decoding and resizing the original PNG.
+"""
+
+import io
+from pathlib import Path
+
+import streamlit as st
+
+CACHE_DIR_NAME = ".cache"
+WEBP_QUALITY = 85
+
+
+def _cache_path(src, width):
+    return src.parent / CACHE_DIR_NAME / f"{src.stem}_{width}.webp"
+
+
+def _encode(src, width):
+    from PIL import Image
+
+    with Image.open(src) as img:
+        if img.width > width:
+            height = round(img.height * width / img.width)
+            img = img.resize((width, height), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.save(buf, format="WEBP", quality=WEBP_QUALITY, method=6)
+    return buf.getvalue()
+
+
+@st.cache_resource(show_spinner=False)
+def load_image(path, width):
+    """Return WebP bytes of `path` resized to `width` pixels."""
+    src = Path(path)
+    cached = _cache_path(src, width)
+
+    if cached.exists() and cached.stat().st_mtime >= src.stat().st_mtime:
+        return cached.read_bytes()
+
+    data = _encode(src, width)
+    try:
+        cached.parent.mkdir(exist_ok=True)
+        cached.write_bytes(data)
+    except OSError:
+        # Read-only filesystem: the in-process cache still applies
+        pass
+    return data
@@ -0,0 +1,193 @@
+"""Preprocessing and prediction for the delivery-time XGBoost model.
+
+Shared by `pages/4_Delivery Time Prediction.py` and the offline batch
+scorer so a single order and a nightly file go through the same encoding.
+
+The model is loaded from a native XGBoost booster file (`xgb_model.ubj` or
+`xgb_model.json`, written once by `python -m scripts.convert_delivery_model`)
+when one exists, and from the `xgb_model.pkl` joblib pickle otherwise.
+Booster files load without the sklearn wrapper, do not depend on the
+xgboost version that pickled them, and predict in place from NumPy.
+`PORTFOLIO_XGB_NTHREAD` sets the prediction threads (default: xgboost's).
+"""
+
+import os
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MODEL_DIR = Path(__file__).resolve().parent.parent / "projects" / "models"
+PREDICTION_COL = "Predicted_Delivery_Time_min"
+MODEL_NAME = "xgb_model"
+# Tried in this order; "pkl" is the joblib-pickled XGBRegressor
+MODEL_FORMATS = ("ubj", "json", "pkl")
+NTHREAD = int(os.environ.get("PORTFOLIO_XGB_NTHREAD", 0)) or None
+
+
+class BoosterModel:
+    """`predict(X)` straight on a native booster, without the sklearn wrapper.
+
+    Rows go to `inplace_predict` as one float32 array, so no DMatrix is
+    built. Predictions match `XGBRegressor.predict`, including early
+    stopping's best iteration.
+    """
+
+    def __init__(self, booster):
+        self.booster = booster
+        best = booster.attr("best_iteration")
+        self.iteration_range = (0, int(best) + 1) if best is not None else (0, 0)
+
+    @property
+    def feature_names(self):
+        return self.booster.feature_names
+
+    def set_threads(self, nthread):
+        self.booster.set_param({"nthread": nthread})
+
+    def predict(self, X):
+        if isinstance(X, pd.DataFrame):
+            X = X.to_numpy(dtype=np.float32)
+        data = np.ascontiguousarray(X, dtype=np.float32)
+        return self.booster.inplace_predict(data, iteration_range=self.iteration_range)
+
+
+def model_path(model_dir, fmt):
+    return Path(model_dir) / f"{MODEL_NAME}.{fmt}"
+
+
+def set_threads(model, nthread):
+    """Set prediction threads on a `BoosterModel` or a pickled `XGBRegressor`."""
+    if isinstance(model, BoosterModel):
+        model.set_threads(nthread)
+    else:
+        model.set_params(n_jobs=nthread)
+
+
+def load_model(model_dir=MODEL_DIR, nthread=NTHREAD, fmt=None):
+    """Load the regressor, preferring a booster file over the pickle.
+
+    A booster file older than `xgb_model.pkl` is stale (the model was
+    retrained without rerunning the converter): the pickle is loaded
+    instead, with a warning. `fmt` forces one of `MODEL_FORMATS`. Both
+    model types expose `predict(X) -> ndarray`.
+    """
+    formats = [fmt] if fmt else MODEL_FORMATS
+    for f in formats:
+        path = model_path(model_dir, f)
+        if path.exists():
+            break
+    else:
+        names = ", ".join(model_path(model_dir, f).name for f in formats)
+        raise FileNotFoundError(f"No delivery model in {model_dir} (looked for {names})")
+
+    pickle_path = model_path(model_dir, "pkl")
+    if (fmt is None and path != pickle_path and pickle_path.exists()
+            and pickle_path.stat().st_mtime > path.stat().st_mtime):
+        warnings.warn(
+            f"{pickle_path.name} is newer than {path.name}; loading the pickle. "
+            "Run `python -m scripts.convert_delivery_model` to refresh the booster file.",
+            stacklevel=2,
+        )
+        path = pickle_path
+
+    if path.suffix == ".pkl":
+        import joblib
+        from xgboost import XGBRegressor  # noqa: F401  (needed to unpickle the model)
+
+        model = joblib.load(path)
+    else:
+        import xgboost as xgb
+
+        model = BoosterModel(xgb.Booster(model_file=str(path)))
+
+    if nthread:
+        set_threads(model, nthread)
+    return model
+
+
+def load_artifacts(model_dir=MODEL_DIR, nthread=NTHREAD):
+    import joblib
+
+    model_dir = Path(model_dir)
+    model = load_model(model_dir, nthread)
+    scaler = joblib.load(model_dir / "scaler.pkl")
+    ohe_columns = joblib.load(model_dir / "ohe_columns.pkl")
+    num_cols = joblib.load(model_dir / "num_cols.pkl")
+    final_features = joblib.load(model_dir / "final_feature_columns.pkl")
+
+    # Arrays carry no column names, so check the order once here
+    names = getattr(model, "feature_names", None)
+    if names and list(names) != list(final_features):
+        raise ValueError("Booster features do not match final_feature_columns.pkl")
+    return model, scaler, ohe_columns, num_cols, final_features
+
+
+def prepare_features(df, scaler, num_cols, final_features):
+    """Scale numeric inputs, one-hot encode and align to training columns.
+
+    Only the model's input columns are encoded (IDs and dates in the file
+    would otherwise become a dummy per unique value). Dummies are built
+    for every category and then reindexed to `final_features`, so the
+    training baseline category is dropped the same way whether the frame
+    holds one order or a million.
+    """
+    df = df[[c for c in input_columns(num_cols, final_features) if c in df.columns]].copy()
+
+    # Scale numerical
+    df[num_cols] = scaler.transform(df[num_cols])
+
+    # One-hot encode categorical
+    encoded = pd.get_dummies(df)
+
+    # Align with training columns
+    return encoded.reindex(columns=final_features, fill_value=0)
+
+
+def _prefixes(name):
+    parts = name.split("_")
+    return ["_".join(parts[:i]) for i in range(1, len(parts))]
+
+
+def categorical_columns(ohe_columns):
+    """Raw categorical columns behind one-hot `ohe_columns`.
+
+    Column and category names both contain underscores, so each dummy's
+    source is the longest `_`-delimited prefix it shares with another
+    dummy (`Type_of_vehicle` for `Type_of_vehicle_scooter`); a dummy with
+    no sibling (`Festival_Yes`) splits at its last underscore.
+    """
+    shared = {}
+    for name in ohe_columns:
+        for prefix in _prefixes(name):
+            shared[prefix] = shared.get(prefix, 0) + 1
+
+    columns = []
+    for name in ohe_columns:
+        candidates = _prefixes(name)
+        common = [p for p in candidates if shared[p] > 1]
+        column = common[-1] if common else candidates[-1]
+        if column not in columns:
+            columns.append(column)
+    return columns
+
+
+def input_columns(num_cols, final_features):
+    """Raw columns the model reads: numeric inputs, then categorical ones."""
+    ohe_columns = [c for c in final_features if c not in num_cols]
+    return list(num_cols) + categorical_columns(ohe_columns)
+
+
+def score_frame(df, model, scaler, num_cols, final_features):
+    """Full raw-frame -> result-frame path used for batch scoring."""
+    # A missing categorical column would silently score every row as its
+    # baseline category, so it is as fatal as a missing numeric one
+    missing = set(input_columns(num_cols, final_features)) - set(df.columns)
+    if missing:
+        raise ValueError(f"Missing required columns: {sorted(missing)}")
+
+    X = prepare_features(df, scaler, num_cols, final_features)
+    result = df.copy()
+    result[PREDICTION_COL] = model.predict(X)
+    return result
@@ -0,0 +1,201 @@
+"""Cleaning, feature alignment and scoring for the fraud CatBoost model.
+
+Shared by `pages/3_Fraud Risk Prediction.py` and the offline batch scorer
+so both paths produce identical features.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.schema import ColumnSpec, Schema, ValidationError, validate
+from utils.sketches import ScoreSummary
+
+MODEL_DIR = Path(__file__).resolve().parent.parent / "projects" / "models"
+TARGET_COL = "FraudFound_P"
+NUMERIC_FEATURES = ["Age"]
+NUMERIC_RANGES = {"Age": (0, 120)}
+
+# Rows checked before the full file is parsed and scored
+PREFIX_ROWS = 5_000
+# Share of rows with errors (non-numeric / out of range) that stops scoring
+MAX_ERROR_RATE = 0.01
+# Rows per predict_proba call when scoring on the page
+SCORE_CHUNK_ROWS = 50_000
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+          "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+YES_NO = ["Yes", "No"]
+
+# Category values seen in training, as strings (the model gets astype(str))
+VOCABULARY = {
+    "DayOfWeek": DAYS,
+    "Make": ["Honda", "Toyota", "Ford", "Mazda", "Chevrolet", "Pontiac", "Accura",
+             "Dodge", "Mercury", "Jaguar", "Nisson", "VW", "Saab", "Saturn",
+             "Porche", "BMW", "Mecedes", "Ferrari", "Lexus"],
+    "AccidentArea": ["Urban", "Rural"],
+    "DayOfWeekClaimed": DAYS + ["0"],
+    "MonthClaimed": MONTHS + ["0"],
+    "Sex": ["Female", "Male"],
+    "MaritalStatus": ["Single", "Married", "Widow", "Divorced"],
+    "Fault": ["Policy Holder", "Third Party"],
+    "PolicyType": ["Sport - Liability", "Sport - Collision", "Sedan - All Perils",
+                   "Sedan - Collision", "Sedan - Liability", "Utility - All Perils",
+                   "Utility - Collision", "Utility - Liability", "Sport - All Perils"],
+    "VehicleCategory": ["Sport", "Sedan", "Utility"],
+    "VehiclePrice": ["more than 69000", "20000 to 29000", "30000 to 39000",
+                     "less than 20000", "40000 to 59000", "60000 to 69000"],
+    "Deductible": ["300", "400", "500", "700"],
+    "DriverRating": ["1", "2", "3", "4"],
+    "Days_Policy_Accident": ["more than 30", "15 to 30", "none", "1 to 7", "8 to 15"],
+    "Days_Policy_Claim": ["more than 30", "15 to 30", "8 to 15", "none"],
+    "PastNumberOfClaims": ["none", "1", "2 to 4", "more than 4"],
+    "AgeOfVehicle": ["new", "2 years", "3 years", "4 years", "5 years",
+                     "6 years", "7 years", "more than 7"],
+    "PoliceReportFiled": YES_NO,
+    "WitnessPresent": YES_NO,
+    "AgentType": ["External", "Internal"],
+    "NumberOfSuppliments": ["none", "1 to 2", "3 to 5", "more than 5"],
+    "AddressChange_Claim": ["no change", "under 6 months", "1 year",
+                            "2 to 3 years", "4 to 8 years"],
+    "NumberOfCars": ["1 vehicle", "2 vehicles", "3 to 4", "5 to 8", "more than 8"],
+    "Year": ["1994", "1995", "1996"],
+    "BasePolicy": ["Liability", "Collision", "All Perils"],
+    "Police_NoWitness": ["0", "1"],
+}
+
+
+def load_feature_columns(model_dir=MODEL_DIR):
+    import joblib
+
+    return joblib.load(Path(model_dir) / "feature_columns.pkl")
+
+
+def load_artifacts(model_dir=MODEL_DIR):
+    import joblib
+    from catboost import CatBoostClassifier
+
+    model_dir = Path(model_dir)
+    model = CatBoostClassifier()
+    model.load_model(str(model_dir / "model_cat.cbm"))
+
+    feature_cols = load_feature_columns(model_dir)
+    threshold = joblib.load(model_dir / "best_threshold.pkl")
+
+    return model, feature_cols, threshold
+
+
+def categorical_features(feature_cols):
+    return [c for c in feature_cols if c not in NUMERIC_FEATURES]
+
+
+def clean(df):
+    """Drop the unnamed index column and the target, if present."""
+    df = df.loc[:, ~df.columns.str.contains("^Unnamed")]
+    if TARGET_COL in df.columns:
+        df = df.drop(columns=[TARGET_COL])
+    return df
+
+
+def missing_columns(df, feature_cols):
+    return set(feature_cols) - set(df.columns)
+
+
+@lru_cache(maxsize=4)
+def _schema(feature_cols):
+    columns = []
+    for col in feature_cols:
+        if col in NUMERIC_FEATURES:
+            lo, hi = NUMERIC_RANGES.get(col, (None, None))
+            columns.append(ColumnSpec(col, "numeric", min=lo, max=hi))
+        else:
+            vocab = VOCABULARY.get(col)
+            columns.append(ColumnSpec(col, vocabulary=frozenset(vocab) if vocab else None))
+    return Schema(columns)
+
+
+def build_schema(feature_cols):
+    """Schema for the columns in `feature_columns.pkl`."""
+    return _schema(tuple(feature_cols))
+
+
+def validate_features(df, feature_cols):
+    """Reorder, check and cast in one pass; return `(X, report)`.
+
+    `X` is None when required columns are missing.
+    """
+    return validate(df, build_schema(feature_cols))
+
+
+def validate_prefix(source, feature_cols, max_error_rate=MAX_ERROR_RATE):
+    """Validate the first `PREFIX_ROWS` rows of a CSV before a full parse.
+
+    `source` is anything `pd.read_csv` accepts. Returns the report, or
+    raises `ValidationError` when its error rate is over `max_error_rate`.
+    """
+    prefix = clean(pd.read_csv(source, nrows=PREFIX_ROWS))
+    _, report = validate_features(prefix, feature_cols)
+    if report.missing_columns:
+        raise ValidationError(f"Missing required columns: {report.missing_columns}", report)
+    if report.error_rate > max_error_rate:
+        raise ValidationError(
+            f"Rejected after checking the first {report.rows:,} rows: {report.summary()}",
+            report,
+        )
+    return report
+
+
+def predict(model, X, threshold, thread_count=-1):
+    """Return `(probability, prediction)` arrays."""
+    fraud_prob = model.predict_proba(X, thread_count=thread_count)[:, 1]
+    fraud_pred = (fraud_prob >= threshold).astype(int)
+    return fraud_prob, fraud_pred
+
+
+def new_summary(feature_cols, threshold):
+    """Empty `ScoreSummary` with a breakdown for every categorical feature."""
+    return ScoreSummary(categorical_features(feature_cols), threshold)
+
+
+def score_chunks(model, X, threshold, summary=None, chunk_rows=SCORE_CHUNK_ROWS,
+                 thread_count=-1):
+    """`predict` in chunks of `chunk_rows`, updating `summary` after each."""
+    probs, preds = [], []
+    for start in range(0, len(X), chunk_rows):
+        chunk = X.iloc[start:start + chunk_rows]
+        fraud_prob, fraud_pred = predict(model, chunk, threshold, thread_count)
+        if summary is not None:
+            summary.update(chunk, fraud_prob, fraud_pred)
+        probs.append(fraud_prob)
+        preds.append(fraud_pred)
+    return np.concatenate(probs), np.concatenate(preds)
+
+
+def score_frame(df, model, feature_cols, threshold, thread_count=-1,
+                max_error_rate=MAX_ERROR_RATE, summary=None):
+    """Full raw-frame -> result-frame path used for batch scoring.
+
+    Returns `(result, report)`, `result` being the cleaned input with
+    `Fraud_Probability` and `Fraud_Prediction` added; raises `ValidationError` (with the report)
+    when columns are missing or the error rate is over `max_error_rate`.
+    Pass a `ScoreSummary` (see `new_summary`) to have it updated with
+    this frame's scores.
+    """
+    result = clean(df)
+    X, report = validate_features(result, feature_cols)
+    if report.missing_columns:
+        raise ValidationError(f"Missing required columns: {report.missing_columns}", report)
+    if report.error_rate > max_error_rate:
+        raise ValidationError(f"Validation failed: {report.summary()}", report)
+    fraud_prob, fraud_pred = predict(model, X, threshold, thread_count)
+    if summary is not None:
+        summary.update(X, fraud_prob, fraud_pred)
+
+    # Identifiers such as PolicyNumber stay, so output joins back to the input
+    result = result.copy()
+    result["Fraud_Probability"] = fraud_prob
+    result["Fraud_Prediction"] = fraud_pred
+    return result, report
@@ -0,0 +1,219 @@
+"""Cross-session micro-batching for shared models.
+
+Streamlit runs every session's script in its own thread, so concurrent
+users each call `predict` / `predict_proba` with a single row. The
+scheduler puts those calls on one queue; a worker thread waits a few
+milliseconds (or until `max_batch_size` rows are queued), runs one
+vectorized prediction and hands every caller its own slice.
+
+    scheduler = get_scheduler(model, "predict_proba")
+    proba = scheduler.predict(input_df)      # blocks until the batch ran
+
+If a batched call raises, each request in it is retried on its own, so
+only the caller whose input fails gets the exception. There is one
+scheduler per (model object, method). It stops and is dropped when the
+model is garbage collected.
+"""
+
+import queue
+import threading
+import time
+import weakref
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_WAIT_MS = 5.0
+LATENCY_WINDOW = 1000
+
+_STOP = object()
+
+
+class _Request:
+    __slots__ = ("data", "rows", "future", "enqueued")
+
+    def __init__(self, data):
+        self.data = data
+        self.rows = len(data)
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+def _concat(parts):
+    if isinstance(parts[0], pd.DataFrame):
+        return pd.concat(parts, ignore_index=True)
+    return np.concatenate(parts)
+
+
+class BatchScheduler:
+    """Gathers prediction requests from many threads into batches."""
+
+    def __init__(self, predict_fn, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS, name="model"):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batch_sizes = Counter()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._requests = 0
+        self._rows = 0
+        self._batches = 0
+        self._errors = 0
+        self._retried_batches = 0
+
+        self._thread = threading.Thread(
+            target=self._loop, name=f"batch-scheduler-{name}", daemon=True
+        )
+        self._thread.start()
+
+    # ----------------------
+    # Client side
+    # ----------------------
+    def submit(self, data):
+        """Queue `data` (DataFrame or array, one or more rows); return a Future."""
+        request = _Request(data)
+        self._queue.put(request)
+        return request.future
+
+    def predict(self, data, timeout=None):
+        return self.submit(data).result(timeout)
+
+    def close(self):
+        self._queue.put(_STOP)
+
+    # ----------------------
+    # Worker side
+    # ----------------------
+    def _gather(self, first):
+        batch = [first]
+        rows = first.rows
+        deadline = time.perf_counter() + self.max_wait
+
+        while rows < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)  # finish this batch, stop on the next loop
+                break
+            batch.append(item)
+            rows += item.rows
+        return batch, rows
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch, rows = self._gather(first)
+            served, errors = self._run(batch)
+
+            done = time.perf_counter()
+            with self._lock:
+                self._batches += 1
+                self._requests += len(served)
+                self._rows += sum(r.rows for r in served)
+                self._errors += errors
+                self._batch_sizes[rows] += 1
+                self._latencies.extend(done - r.enqueued for r in served)
+
+    def _run(self, batch):
+        """Predict `batch` in one call; return `(served requests, errors)`.
+
+        When the batched call fails, every request is retried alone so one
+        session's bad input does not fail the others.
+        """
+        try:
+            result = self.predict_fn(_concat([r.data for r in batch]))
+        except Exception as exc:
+            if len(batch) == 1:
+                batch[0].future.set_exception(exc)
+                return [], 1
+            with self._lock:
+                self._retried_batches += 1
+            served, errors = [], 0
+            for r in batch:
+                ok, failed = self._run([r])
+                served += ok
+                errors += failed
+            return served, errors
+
+        offset = 0
+        for r in batch:
+            r.future.set_result(result[offset:offset + r.rows])
+            offset += r.rows
+        return batch, 0
+
+    # ----------------------
+    # Metrics
+    # ----------------------
+    def metrics(self):
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            p50, p95, p99 = (
+                [float(v) for v in np.percentile(latencies, [50, 95, 99])]
+                if latencies.size else (None,) * 3
+            )
+            return {
+                "name": self.name,
+                "queue_depth": self._queue.qsize(),
+                "requests": self._requests,
+                "rows": self._rows,
+                "batches": self._batches,
+                "errors": self._errors,
+                "retried_batches": self._retried_batches,
+                "mean_batch_size": self._rows / self._batches if self._batches else None,
+                "max_batch_size_seen": max(self._batch_sizes, default=None),
+                "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+                "latency_ms_p50": p50,
+                "latency_ms_p95": p95,
+                "latency_ms_p99": p99,
+            }
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _drop(key):
+    with _registry_lock:
+        scheduler = _registry.pop(key, None)
+    if scheduler is not None:
+        scheduler.close()
+
+
+def get_scheduler(model, method="predict", **options):
+    """Return the shared scheduler for `getattr(model, method)`."""
+    key = (id(model), method)
+    with _registry_lock:
+        scheduler = _registry.get(key)
+        if scheduler is None:
+            # Weak reference: the scheduler must not keep the model alive
+            ref = weakref.WeakMethod(getattr(model, method))
+
+            def predict_fn(data):
+                fn = ref()
+                if fn is None:
+                    raise ReferenceError("model was garbage collected")
+                return fn(data)
+
+            scheduler = BatchScheduler(
+                predict_fn,
+                name=f"{type(model).__name__}.{method}",
+                **options,
+            )
+            _registry[key] = scheduler
+            weakref.finalize(model, _drop, key)
+    return scheduler
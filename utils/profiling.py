@@ -0,0 +1,156 @@
+"""Per-rerun stage timing and memory instrumentation.
+
+Usage in a page:
+
+    prof = Profiler("fraud")
+
+    with prof.stage("read_csv") as s:
+        df = pd.read_csv(uploaded_file)
+        s.rows = len(df)
+
+Profiling is opt-in and operator-only. `PORTFOLIO_PROFILE_UI=1` shows a
+sidebar debug toggle (it also reveals the process-wide memory panels,
+so leave it unset on a public deployment); `PORTFOLIO_PROFILE=1` forces
+profiling on for every session. When off, `stage()` hands back a
+shared no-op object, so the cost is one attribute lookup per stage.
+When on, every stage is shown in a sidebar panel and appended as a JSON
+line to `PORTFOLIO_PROFILE_LOG` (default `logs/stage_timings.jsonl`).
+
+Allocation tracking uses tracemalloc, which slows every session in the
+process down noticeably, so it is not a per-user toggle: it is on only
+when the server is started with `PORTFOLIO_PROFILE_MEMORY=1`. tracemalloc
+is process-wide, so `alloc_mb` and `peak_mb` include whatever other
+sessions allocated during the stage; read them on a quiet server. Stages
+are meant to be flat; nesting them skews the inner peak memory.
+"""
+
+import json
+import os
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import streamlit as st
+
+LOG_PATH = Path(os.environ.get("PORTFOLIO_PROFILE_LOG", "logs/stage_timings.jsonl"))
+TOGGLE_KEY = "_profiling_enabled"
+FORCE_ON = os.environ.get("PORTFOLIO_PROFILE") == "1"
+SHOW_TOGGLE = os.environ.get("PORTFOLIO_PROFILE_UI") == "1"
+TRACK_MEMORY = os.environ.get("PORTFOLIO_PROFILE_MEMORY") == "1"
+MB = 1024 * 1024
+
+
+class _NullStage:
+    """Shared do-nothing stage used while profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, profiler, name, rows):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        self._track = self.profiler.track_memory and tracemalloc.is_tracing()
+        if self._track:
+            tracemalloc.reset_peak()
+            self._mem_start = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._start
+        alloc_mb = peak_mb = None
+        if self._track:
+            current, peak = tracemalloc.get_traced_memory()
+            alloc_mb = round((current - self._mem_start) / MB, 3)
+            peak_mb = round((peak - self._mem_start) / MB, 3)
+
+        self.profiler._record({
+            "stage": self.name,
+            "wall_ms": round(wall * 1000, 2),
+            "alloc_mb": alloc_mb,
+            "peak_mb": peak_mb,
+            "rows": self.rows,
+            "error": exc_type.__name__ if exc_type else None,
+        })
+        return False
+
+
+class Profiler:
+    """Collects the stages of a single rerun of one page."""
+
+    def __init__(self, page):
+        self.page = page
+        self.enabled = FORCE_ON or (
+            SHOW_TOGGLE and st.sidebar.toggle("🛠 Debug: stage timings", key=TOGGLE_KEY)
+        )
+        self.records = []
+
+        if not self.enabled:
+            self.track_memory = False
+            self._panel = None
+            return
+
+        self.track_memory = TRACK_MEMORY
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.run_id = uuid.uuid4().hex[:12]
+        self._panel = st.sidebar.empty()
+
+    def stage(self, name, rows=None):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, rows)
+
+    def _record(self, record):
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "page": self.page,
+            "run_id": self.run_id,
+            **record,
+        }
+        self.records.append(record)
+        self._write(record)
+        self._render()
+
+    def _write(self, record):
+        try:
+            LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with LOG_PATH.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            # Read-only deployments still get the sidebar panel
+            pass
+
+    def _render(self):
+        with self._panel.container():
+            st.caption(f"Rerun `{self.run_id}` · {len(self.records)} stages")
+            st.dataframe(
+                [
+                    {k: r[k] for k in ("stage", "wall_ms", "alloc_mb", "peak_mb", "rows")}
+                    for r in self.records
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+            total = sum(r["wall_ms"] for r in self.records)
+            st.caption(f"Total instrumented time: {total:,.1f} ms")
+            if self.track_memory:
+                st.caption("alloc_mb / peak_mb are process-wide (all sessions).")
@@ -0,0 +1,132 @@
+"""Monte Carlo retention impact simulation on top of the RFM table.
+
+Customers are grouped into strata (segment x frequency x monetary bin).
+Inside a stratum every customer shares the same order count, so the number
+of successes can be drawn with a single binomial per stratum and trial,
+and the spread of order values inside the stratum is added back with a
+normal correction. This keeps the expected value exact per customer while
+making a thousand trials on 100k customers a few small NumPy arrays.
+Binomial draws dominate the cost, so only strata that can convert are
+drawn; values are float32 (sums are taken in float64).
+"""
+
+import numpy as np
+import pandas as pd
+
+REACTIVATION_SEGMENT = "Hibernating"
+PERCENTILES = (5, 50, 95)
+# Enough for stable 5th/95th percentile bands; keeps a slider rerun on
+# ~100k customers (~400 strata) under 200ms on one core
+N_TRIALS = 1000
+
+
+def build_strata(rfm, n_bins=8):
+    """Collapse the RFM table into simulation strata.
+
+    Expects the `user_id`, `frequency`, `monetary` and `rfm_segment`
+    columns of `rfm_table.csv`.
+    """
+    df = rfm[["rfm_segment", "frequency", "monetary"]].copy()
+    df["frequency"] = df["frequency"].clip(lower=1).astype(int)
+    df["aov"] = df["monetary"] / df["frequency"]
+
+    ranks = df["monetary"].rank(method="first", pct=True)
+    df["m_bin"] = np.minimum((ranks * n_bins).astype(int), n_bins - 1)
+
+    strata = (
+        df.groupby(["rfm_segment", "frequency", "m_bin"], observed=True)
+        .agg(
+            customers=("monetary", "size"),
+            mean_aov=("aov", "mean"),
+            std_aov=("aov", "std"),
+            mean_monetary=("monetary", "mean"),
+            std_monetary=("monetary", "std"),
+        )
+        .reset_index()
+        .fillna({"std_aov": 0.0, "std_monetary": 0.0})
+    )
+    return strata
+
+
+def _stratified_sum(rng, counts, probs, mean, std, n_trials):
+    """Draw total value of binomial successes per (trial, stratum).
+
+    Strata with a zero probability are left at zero without a draw.
+    """
+    out = np.zeros((n_trials, counts.size), dtype=np.float32)
+    live = np.flatnonzero(probs > 0)
+    if not live.size:
+        return out
+    k = rng.binomial(counts[live], probs[live], size=(n_trials, live.size)).astype(np.float32)
+    noise = rng.standard_normal(k.shape, dtype=np.float32) * np.sqrt(k)
+    noise *= std[live].astype(np.float32)
+    out[:, live] = np.maximum(k * mean[live].astype(np.float32) + noise, 0.0)
+    return out
+
+
+def simulate_retention(
+    strata,
+    reactivation_rate,
+    repeat_uplift,
+    n_trials=N_TRIALS,
+    seed=42,
+):
+    """Simulate incremental revenue for the given campaign rates.
+
+    `reactivation_rate` is the probability that a Hibernating customer
+    buys again (worth their historical monetary value), `repeat_uplift`
+    the probability that any past order is repeated (worth the customer's
+    average order value). Both are fractions in [0, 1].
+
+    Returns `(bands, totals)`: a DataFrame of percentile bands per segment
+    and a dict of per-trial totals for `reactivation`, `repeat` and `total`.
+    """
+    rng = np.random.default_rng(seed)
+    segments = strata["rfm_segment"].to_numpy()
+    customers = strata["customers"].to_numpy()
+    frequency = strata["frequency"].to_numpy()
+
+    is_hib = segments == REACTIVATION_SEGMENT
+    react_probs = np.where(is_hib, reactivation_rate, 0.0)
+    reactivation = _stratified_sum(
+        rng,
+        customers,
+        react_probs,
+        strata["mean_monetary"].to_numpy(),
+        strata["std_monetary"].to_numpy(),
+        n_trials,
+    )
+
+    repeat = _stratified_sum(
+        rng,
+        customers * frequency,
+        np.full(customers.size, repeat_uplift),
+        strata["mean_aov"].to_numpy(),
+        strata["std_aov"].to_numpy(),
+        n_trials,
+    )
+
+    gain = reactivation + repeat
+
+    # Sum strata -> segments with one matrix product
+    seg_names, seg_idx = np.unique(segments, return_inverse=True)
+    onehot = np.zeros((segments.size, seg_names.size))
+    onehot[np.arange(segments.size), seg_idx] = 1.0
+    seg_gain = gain.astype(np.float64) @ onehot
+
+    pct = np.percentile(seg_gain, PERCENTILES, axis=0)
+    bands = pd.DataFrame({
+        "Segment": seg_names,
+        "Customers": np.bincount(seg_idx, weights=customers).astype(int),
+        "Mean": seg_gain.mean(axis=0),
+    })
+    for p, row in zip(PERCENTILES, pct):
+        bands[f"P{p}"] = row
+    bands = bands.sort_values("Mean", ascending=False).reset_index(drop=True)
+
+    totals = {
+        "reactivation": reactivation.sum(axis=1, dtype=np.float64),
+        "repeat": repeat.sum(axis=1, dtype=np.float64),
+        "total": seg_gain.sum(axis=1),
+    }
+    return bands, totals
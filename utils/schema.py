@@ -0,0 +1,197 @@
+"""Declared column schemas with single-pass validation and coercion.
+
+`validate(df, schema)` checks and coerces every column while reading each
+value once: numeric columns go through one `to_numeric` block with range
+checks, categorical columns are factorized so the string cast, null check
+and vocabulary check run on the few distinct values and are broadcast
+back through the codes. It returns the coerced frame plus a
+`ValidationReport` of issue counts and sample row indices; reports of
+chunks validated separately (or in other processes) combine with `merge`.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+ERROR, WARNING = "error", "warning"
+
+# issue -> severity
+ISSUES = {
+    "missing_column": ERROR,
+    "not_numeric": ERROR,
+    "out_of_range": ERROR,
+    "unknown_category": WARNING,
+    "null": WARNING,
+}
+SAMPLE_ROWS = 5
+
+
+class ValidationError(ValueError):
+    """Data failed validation; `report` says where."""
+
+    def __init__(self, message, report):
+        super().__init__(message)
+        self.report = report
+
+
+@dataclass
+class ColumnSpec:
+    name: str
+    kind: str = "categorical"  # "numeric" or "categorical"
+    vocabulary: frozenset = None
+    min: float = None
+    max: float = None
+
+
+@dataclass
+class Schema:
+    columns: list
+
+    @property
+    def names(self):
+        return [c.name for c in self.columns]
+
+    def of_kind(self, kind):
+        return [c for c in self.columns if c.kind == kind]
+
+
+@dataclass
+class ValidationReport:
+    rows: int = 0
+    error_rows: int = 0
+    counts: dict = field(default_factory=dict)   # (column, issue) -> n
+    samples: dict = field(default_factory=dict)  # (column, issue) -> [row index]
+
+    @property
+    def error_rate(self):
+        return self.error_rows / self.rows if self.rows else 0.0
+
+    @property
+    def has_errors(self):
+        return any(ISSUES[issue] == ERROR for _, issue in self.counts)
+
+    @property
+    def missing_columns(self):
+        return sorted(col for col, issue in self.counts if issue == "missing_column")
+
+    def add(self, column, issue, mask, index):
+        n = int(mask.sum())
+        if not n:
+            return
+        key = (column, issue)
+        self.counts[key] = self.counts.get(key, 0) + n
+        have = self.samples.setdefault(key, [])
+        if len(have) < SAMPLE_ROWS:
+            have.extend(index[np.flatnonzero(mask)[:SAMPLE_ROWS - len(have)]].tolist())
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.error_rows += other.error_rows
+        for key, n in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + n
+            have = self.samples.setdefault(key, [])
+            have.extend(other.samples.get(key, [])[:SAMPLE_ROWS - len(have)])
+        return self
+
+    def to_frame(self):
+        return pd.DataFrame(
+            [
+                {
+                    "column": col,
+                    "issue": issue,
+                    "severity": ISSUES[issue],
+                    "count": n,
+                    "sample_rows": self.samples.get((col, issue), []),
+                }
+                for (col, issue), n in sorted(
+                    self.counts.items(), key=lambda kv: (ISSUES[kv[0][1]] != ERROR, -kv[1])
+                )
+            ],
+            columns=["column", "issue", "severity", "count", "sample_rows"],
+        )
+
+    def to_dict(self):
+        """JSON-friendly view for reports."""
+        return {
+            "rows": self.rows,
+            "error_rows": self.error_rows,
+            "error_rate": round(self.error_rate, 6),
+            "issues": [
+                {
+                    "column": col,
+                    "issue": issue,
+                    "severity": ISSUES[issue],
+                    "count": int(n),
+                    "sample_rows": [int(i) for i in self.samples.get((col, issue), [])],
+                }
+                for (col, issue), n in self.counts.items()
+            ],
+        }
+
+    def summary(self):
+        return (
+            f"{self.error_rows:,} of {self.rows:,} rows with errors "
+            f"({self.error_rate:.2%}), {len(self.counts)} issue type(s)"
+        )
+
+
+def validate(df, schema):
+    """Check and coerce `df` against `schema`.
+
+    Returns `(coerced, report)`. Numeric columns are coerced with
+    `to_numeric(errors="coerce")` and categorical columns with
+    `astype(str)`, the same casting the model was fed before; the report
+    records what that coercion hid.
+    """
+    report = ValidationReport(rows=len(df))
+    index = df.index.to_numpy()
+
+    missing = [c for c in schema.names if c not in df.columns]
+    for col in missing:
+        report.counts[(col, "missing_column")] = len(df)
+        report.samples[(col, "missing_column")] = []
+    if missing:
+        report.error_rows = len(df)
+        return None, report
+
+    raw = df[schema.names]
+    error_mask = np.zeros(len(df), dtype=bool)
+    out = {}
+
+    numeric = schema.of_kind("numeric")
+    if numeric:
+        names = [c.name for c in numeric]
+        nulls = raw[names].isna().to_numpy()
+        coerced = raw[names].apply(pd.to_numeric, errors="coerce")
+        bad = coerced.isna().to_numpy() & ~nulls
+
+        lo = np.array([-np.inf if c.min is None else c.min for c in numeric])
+        hi = np.array([np.inf if c.max is None else c.max for c in numeric])
+        values = coerced.to_numpy(dtype=float)
+        with np.errstate(invalid="ignore"):
+            out_of_range = (values < lo) | (values > hi)
+
+        for j, spec in enumerate(numeric):
+            report.add(spec.name, "not_numeric", bad[:, j], index)
+            report.add(spec.name, "out_of_range", out_of_range[:, j], index)
+            report.add(spec.name, "null", nulls[:, j], index)
+        error_mask |= bad.any(axis=1) | out_of_range.any(axis=1)
+        out.update(coerced.items())
+
+    for spec in schema.of_kind("categorical"):
+        codes, uniques = pd.factorize(raw[spec.name])
+        # Same strings as Series.astype(str); code -1 (NaN) maps to "nan"
+        labels = np.append(np.asarray(uniques).astype(str).astype(object), "nan")
+        null = codes == -1
+        report.add(spec.name, "null", null, index)
+
+        if spec.vocabulary:
+            known = np.isin(labels, list(spec.vocabulary))
+            report.add(spec.name, "unknown_category", ~known[codes] & ~null, index)
+
+        out[spec.name] = pd.Series(labels[codes], index=df.index, dtype=object)
+
+    report.error_rows = int(error_mask.sum())
+    return pd.DataFrame(out, index=df.index)[schema.names], report
+
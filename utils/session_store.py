@@ -0,0 +1,295 @@
+"""Session-state store with a process-wide memory budget.
+
+Large per-user objects (training frames, scored uploads) go through
+`session_store()` instead of `st.session_state`. Every entry is sized
+when stored; once the total across all sessions exceeds the budget, the
+least recently used large entries are pickled to a local spill directory
+(or dropped, for entries stored with `spill=False`). Reading a spilled
+entry loads it back transparently; reading a dropped one raises KeyError
+like a missing key, so pages fall back to "please upload / train again".
+
+    store = session_store()
+    store["X_ref"] = X
+    if "X_ref" in store:
+        X_ref = store["X_ref"]
+
+Configuration: `PORTFOLIO_SESSION_BUDGET_MB` (default 512) and
+`PORTFOLIO_SPILL_DIR` (default: a temp directory).
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+BUDGET_BYTES = int(float(os.environ.get("PORTFOLIO_SESSION_BUDGET_MB", 512)) * 1024 * 1024)
+SPILL_DIR = Path(os.environ.get("PORTFOLIO_SPILL_DIR", Path(tempfile.gettempdir()) / "portfolio_spill"))
+# Entries smaller than this are never evicted, the bookkeeping is not worth it
+MIN_EVICT_BYTES = 1024 * 1024
+STATE_KEY = "_session_store"
+MB = 1024 * 1024
+
+RESIDENT, EVICTING, SPILLED, DROPPED = "memory", "evicting", "disk", "dropped"
+
+
+def measure(value):
+    """Approximate in-memory size of `value` in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _Entry:
+    __slots__ = ("session_id", "key", "value", "size", "spill", "path",
+                 "state", "last_access", "io_lock", "__weakref__")
+
+    def __init__(self, session_id, key, value, spill):
+        self.session_id = session_id
+        self.key = key
+        self.value = value
+        self.size = measure(value)
+        self.spill = spill
+        self.path = None
+        self.state = RESIDENT
+        self.last_access = time.monotonic()
+        # Serializes this entry's spill and reload; never held with the budget lock
+        self.io_lock = threading.Lock()
+
+
+class MemoryBudget:
+    """Tracks resident entries of every session against one budget.
+
+    Eviction victims are chosen under the budget lock; the pickling and
+    unpickling happen outside it, so one session's disk I/O never blocks
+    another session's reads and writes.
+    """
+
+    def __init__(self, budget_bytes=BUDGET_BYTES, spill_dir=SPILL_DIR):
+        self.budget_bytes = budget_bytes
+        self.spill_dir = Path(spill_dir)
+        self._entries = weakref.WeakSet()
+        self._lock = threading.RLock()
+        self.spills = 0
+        self.drops = 0
+        self.rehydrations = 0
+
+    @property
+    def resident_bytes(self):
+        return sum(e.size for e in self._entries if e.state == RESIDENT)
+
+    def track(self, entry):
+        with self._lock:
+            self._entries.add(entry)
+            victims = self._select(protect=entry)
+        self._evict(victims)
+
+    def touch(self, entry):
+        with self._lock:
+            entry.last_access = time.monotonic()
+            if entry.state != SPILLED:
+                return entry.value
+
+        with entry.io_lock:
+            with self._lock:
+                if entry.state != SPILLED:  # reloaded by another thread meanwhile
+                    return entry.value
+                path = entry.path
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            with self._lock:
+                entry.value = value
+                entry.path = None
+                entry.state = RESIDENT
+                self.rehydrations += 1
+                victims = self._select(protect=entry)
+        _remove(path)
+        self._evict(victims)
+        return value
+
+    def _select(self, protect):
+        """Pick least recently used entries to free; call with the lock held.
+
+        Returns `(entry, last_access)` pairs, already marked EVICTING or
+        DROPPED.
+        """
+        resident = self.resident_bytes
+        if resident <= self.budget_bytes:
+            return []
+
+        candidates = sorted(
+            (e for e in self._entries
+             if e.state == RESIDENT and e is not protect and e.size >= MIN_EVICT_BYTES),
+            key=lambda e: e.last_access,
+        )
+        victims = []
+        for entry in candidates:
+            if resident <= self.budget_bytes:
+                break
+            resident -= entry.size
+            if entry.spill:
+                entry.state = EVICTING
+                victims.append((entry, entry.last_access))
+            else:
+                entry.state = DROPPED
+                entry.value = None
+                self.drops += 1
+        return victims
+
+    def _evict(self, victims):
+        for entry, seen in victims:
+            with entry.io_lock:
+                self._spill(entry, seen)
+
+    def _spill(self, entry, seen):
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            path = self.spill_dir / f"{uuid.uuid4().hex}.pkl"
+            with open(path, "wb") as f:
+                pickle.dump(entry.value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (OSError, pickle.PicklingError):
+            with self._lock:
+                entry.state = DROPPED
+                entry.value = None
+                self.drops += 1
+            return
+
+        with self._lock:
+            if entry.last_access != seen:
+                # Read while it was being written: keep it in memory
+                entry.state = RESIDENT
+                stale = True
+            else:
+                entry.path = str(path)
+                entry.state = SPILLED
+                entry.value = None
+                # Delete the spill file when the session (and entry) goes away
+                weakref.finalize(entry, _remove, entry.path)
+                self.spills += 1
+                stale = False
+        if stale:
+            _remove(path)
+
+    def summary(self):
+        with self._lock:
+            entries = list(self._entries)
+        return {
+            "budget_mb": self.budget_bytes / MB,
+            "resident_mb": sum(e.size for e in entries if e.state == RESIDENT) / MB,
+            "spilled_mb": sum(e.size for e in entries if e.state == SPILLED) / MB,
+            "entries": len(entries),
+            "sessions": len({e.session_id for e in entries}),
+            "spills": self.spills,
+            "drops": self.drops,
+            "rehydrations": self.rehydrations,
+        }
+
+
+_budget = MemoryBudget()
+
+
+class SessionStore:
+    """Dict-like view of one session's budgeted entries."""
+
+    def __init__(self, session_id, budget=_budget):
+        self.session_id = session_id
+        self.budget = budget
+        self._entries = {}
+
+    def set(self, key, value, spill=True):
+        entry = _Entry(self.session_id, key, value, spill)
+        self._entries[key] = entry
+        self.budget.track(entry)
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __getitem__(self, key):
+        entry = self._entries[key]
+        if entry.state == DROPPED:
+            del self._entries[key]
+            raise KeyError(key)
+        return self.budget.touch(entry)
+
+    def __contains__(self, key):
+        entry = self._entries.get(key)
+        return entry is not None and entry.state != DROPPED
+
+    def __delitem__(self, key):
+        del self._entries[key]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return [k for k in self._entries if k in self]
+
+    def entries(self):
+        now = time.monotonic()
+        return [
+            {
+                "key": e.key,
+                "size_mb": round(e.size / MB, 3),
+                "state": e.state,
+                "idle_s": round(now - e.last_access, 1),
+            }
+            for e in self._entries.values()
+        ]
+
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
+
+
+def session_store():
+    """Return the current session's store, creating it on first use."""
+    if STATE_KEY not in st.session_state:
+        st.session_state[STATE_KEY] = SessionStore(_session_id())
+    return st.session_state[STATE_KEY]
+
+
+def render_memory_view():
+    """Sidebar panel with this session's entries and the global budget."""
+    store = session_store()
+    summary = store.budget.summary()
+
+    with st.sidebar.expander("Session memory"):
+        st.caption(
+            f"Process: {summary['resident_mb']:,.1f} / {summary['budget_mb']:,.0f} MB resident, "
+            f"{summary['spilled_mb']:,.1f} MB on disk across {summary['sessions']} sessions"
+        )
+        entries = store.entries()
+        if entries:
+            st.dataframe(entries, hide_index=True, use_container_width=True)
+        else:
+            st.caption("Nothing stored for this session yet.")
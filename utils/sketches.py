@@ -0,0 +1,223 @@
+"""Mergeable streaming summaries of model scores.
+
+Each summary is updated one chunk at a time and keeps a bounded amount of
+state, so a distribution can be described without holding every score.
+Summaries built in different chunks or worker processes combine with
+`merge` (they pickle cheaply) into the same result as one pass over all
+rows, up to the quantile sketch's error.
+
+    summary = ScoreSummary(["PolicyType", "Make"], threshold=0.5)
+    for X, prob, pred in chunks:
+        summary.update(X, prob, pred)
+    summary.quantiles([0.5, 0.9, 0.99])
+    summary.histogram.to_frame()
+    summary.breakdown("PolicyType")
+"""
+
+import numpy as np
+import pandas as pd
+
+# Compactor size of the quantile sketch; rank error is roughly 1.7 / k
+DEFAULT_K = 200
+DEFAULT_BINS = 50
+
+
+class QuantileSketch:
+    """KLL quantile sketch: levels of sorted compactors, level h weighing 2**h.
+
+    A level over its capacity is sorted and every other item (random
+    offset) moves up a level, so memory stays O(k log(n / k)).
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        self.k = k
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind at this level
+                even = len(items) - len(items) % 2
+                promoted = items[:even][self._rng.integers(2)::2]
+                self.levels[level] = items[even:]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return self
+        self.n += values.size
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._compress()
+        return self
+
+    def quantiles(self, qs):
+        """Approximate values at ranks `qs` (0..1); NaN when empty."""
+        qs = np.asarray(qs, dtype=float)
+        if not self.n:
+            return np.full(qs.shape, np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(v), 2 ** h) for h, v in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        items, cum = items[order], np.cumsum(weights[order])
+        idx = np.searchsorted(cum, qs * cum[-1], side="left")
+        out = items[np.minimum(idx, len(items) - 1)]
+        # The extremes are tracked exactly
+        out = np.where(qs <= 0, self.min, np.where(qs >= 1, self.max, out))
+        return out
+
+    @property
+    def size(self):
+        return sum(len(v) for v in self.levels)
+
+
+class Histogram:
+    """Fixed-bin counts over `[low, high]`; values outside go to the edge bins."""
+
+    def __init__(self, bins=DEFAULT_BINS, low=0.0, high=1.0):
+        self.low = low
+        self.high = high
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    @property
+    def edges(self):
+        return np.linspace(self.low, self.high, len(self.counts) + 1)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        bins = len(self.counts)
+        idx = ((values - self.low) / (self.high - self.low) * bins).astype(np.int64)
+        self.counts += np.bincount(np.clip(idx, 0, bins - 1), minlength=bins)
+        return self
+
+    def merge(self, other):
+        if len(other.counts) != len(self.counts) or (other.low, other.high) != (self.low, self.high):
+            raise ValueError("Histograms with different bins cannot be merged")
+        self.counts += other.counts
+        return self
+
+    def to_frame(self):
+        edges = self.edges
+        return pd.DataFrame({"low": edges[:-1], "high": edges[1:], "count": self.counts})
+
+
+class CategoryCounts:
+    """Rows and flagged rows per value of each category column."""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        # column -> {value: [rows, flagged]}
+        self.counts = {c: {} for c in self.columns}
+
+    def update(self, frame, flags):
+        flags = np.asarray(flags, dtype=np.int64)
+        for col in self.columns:
+            codes, uniques = pd.factorize(frame[col], use_na_sentinel=False)
+            rows = np.bincount(codes, minlength=len(uniques))
+            flagged = np.bincount(codes, weights=flags, minlength=len(uniques))
+            have = self.counts[col]
+            for value, r, f in zip(uniques.astype(str), rows, flagged):
+                c = have.setdefault(value, [0, 0])
+                c[0] += int(r)
+                c[1] += int(f)
+        return self
+
+    def merge(self, other):
+        for col, values in other.counts.items():
+            have = self.counts.setdefault(col, {})
+            for value, (r, f) in values.items():
+                c = have.setdefault(value, [0, 0])
+                c[0] += r
+                c[1] += f
+        return self
+
+    def to_frame(self, column):
+        df = pd.DataFrame(
+            [(v, r, f) for v, (r, f) in self.counts[column].items()],
+            columns=["value", "rows", "flagged"],
+        )
+        df["flag_rate"] = df["flagged"] / df["rows"].where(df["rows"] > 0)
+        return df.sort_values("flag_rate", ascending=False, ignore_index=True)
+
+
+class ScoreSummary:
+    """Quantiles, histogram and per-category flag counts of one scoring run."""
+
+    def __init__(self, columns, threshold=None, bins=DEFAULT_BINS, low=0.0, high=1.0,
+                 k=DEFAULT_K, seed=None):
+        self.threshold = threshold
+        self.rows = 0
+        self.flagged = 0
+        self.sketch = QuantileSketch(k, seed)
+        self.histogram = Histogram(bins, low, high)
+        self.categories = CategoryCounts(columns)
+
+    def update(self, frame, scores, flags):
+        self.rows += len(scores)
+        self.flagged += int(np.sum(flags))
+        self.sketch.update(scores)
+        self.histogram.update(scores)
+        self.categories.update(frame, flags)
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.flagged += other.flagged
+        self.sketch.merge(other.sketch)
+        self.histogram.merge(other.histogram)
+        self.categories.merge(other.categories)
+        return self
+
+    @property
+    def flag_rate(self):
+        return self.flagged / self.rows if self.rows else 0.0
+
+    def quantiles(self, qs):
+        return self.sketch.quantiles(qs)
+
+    def breakdown(self, column):
+        return self.categories.to_frame(column)
+
+    def to_dict(self, qs=(0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)):
+        """JSON-friendly view for reports."""
+        return {
+            "rows": self.rows,
+            "flagged": self.flagged,
+            "flag_rate": round(self.flag_rate, 6),
+            "threshold": self.threshold,
+            "quantiles": {str(q): round(float(v), 6) for q, v in zip(qs, self.quantiles(qs))},
+            "histogram": {
+                "edges": [round(float(e), 6) for e in self.histogram.edges],
+                "counts": self.histogram.counts.tolist(),
+            },
+            "categories": self.categories.counts,
+        }
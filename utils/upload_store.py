@@ -0,0 +1,250 @@
+"""Content-addressed store of parsed CSV uploads, shared by every page.
+
+Uploads are keyed by a BLAKE2 hash of their bytes, so the same file
+uploaded again (after a refresh, or on the churn and then the fraud page)
+skips `pd.read_csv` entirely.
+
+Frames are kept compact at rest (integers downcast, repetitive strings as
+categories) and restored to the dtypes `read_csv` produced on the way
+out, so pages see exactly the frame they would have parsed. When the
+memory tier is over `PORTFOLIO_UPLOAD_CACHE_MB` (default 256) the least
+recently used frames move to Parquet files on disk, capped by
+`PORTFOLIO_UPLOAD_DISK_MB` (default 1024).
+"""
+
+import atexit
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+MEMORY_BYTES = int(float(os.environ.get("PORTFOLIO_UPLOAD_CACHE_MB", 256)) * 1024 * 1024)
+DISK_BYTES = int(float(os.environ.get("PORTFOLIO_UPLOAD_DISK_MB", 1024)) * 1024 * 1024)
+CACHE_DIR = Path(os.environ.get(
+    "PORTFOLIO_UPLOAD_CACHE_DIR", Path(tempfile.gettempdir()) / "portfolio_uploads"
+))
+# Strings with fewer distinct values than this share of rows become categories
+CATEGORY_RATIO = 0.5
+MB = 1024 * 1024
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def compact(df):
+    """Shrink `df` for storage; return `(compact_df, original_dtypes)`."""
+    dtypes = df.dtypes.to_dict()
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_integer_dtype(s.dtype):
+            s = pd.to_numeric(s, downcast="integer")
+        elif s.dtype == object and len(s) and s.nunique(dropna=True) < CATEGORY_RATIO * len(s):
+            s = s.astype("category")
+        out[col] = s
+    return pd.DataFrame(out, index=df.index), dtypes
+
+
+def restore(compact_df, dtypes):
+    """Return a fresh frame with the dtypes `read_csv` originally produced."""
+    return compact_df.astype(dtypes, copy=True)
+
+
+class _Item:
+    __slots__ = ("frame", "dtypes", "size", "parse_s", "path")
+
+    def __init__(self, frame, dtypes, parse_s):
+        self.frame = frame
+        self.dtypes = dtypes
+        self.size = int(frame.memory_usage(deep=True).sum())
+        self.parse_s = parse_s
+        self.path = None
+
+
+class UploadStore:
+    """Two-tier (memory, then Parquet on disk) LRU of parsed uploads.
+
+    The lock only guards the indexes: parsing, restoring dtypes and all
+    Parquet reads and writes run outside it, so one session spilling or
+    reloading a large frame does not block other sessions' lookups.
+    """
+
+    def __init__(self, memory_bytes=MEMORY_BYTES, disk_bytes=DISK_BYTES, cache_dir=CACHE_DIR):
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.cache_root = Path(cache_dir)
+        self.cache_dir = None
+        self._memory = OrderedDict()
+        self._spilling = {}  # evicted from memory, Parquet write in progress
+        self._disk = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0,
+                      "parse_s_saved": 0.0}
+
+    def read_csv(self, data, on_miss=None, **kwargs):
+        """Parse CSV bytes, or return the stored frame for identical bytes.
+
+        Returns `(DataFrame, digest)`. Different `read_csv` options are
+        cached separately. `on_miss(data)` runs only when the bytes have
+        to be parsed, before parsing; raise from it to reject the upload.
+        """
+        digest = content_hash(data)
+        key = (digest, tuple(sorted(kwargs.items())))
+
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                self._memory.move_to_end(key)
+            else:
+                item = self._spilling.get(key)
+
+            if item is not None:
+                self.stats["hits"] += 1
+                self.stats["parse_s_saved"] += item.parse_s
+                frame, dtypes = item.frame, item.dtypes
+            else:
+                item = self._disk.pop(key, None)
+                if item is not None:
+                    self.stats["disk_hits"] += 1
+                    self.stats["parse_s_saved"] += item.parse_s
+                else:
+                    self.stats["misses"] += 1
+                frame = None
+
+        if frame is not None:
+            return restore(frame, dtypes), digest
+
+        if item is not None:
+            # Disk hit: reload outside the lock
+            item.frame = pd.read_parquet(item.path)
+            _remove(item.path)
+            item.path = None
+            df = restore(item.frame, item.dtypes)
+        else:
+            # Parse outside the lock so other sessions are not blocked
+            if on_miss is not None:
+                on_miss(data)
+            start = time.perf_counter()
+            df = pd.read_csv(io.BytesIO(data), **kwargs)
+            frame, dtypes = compact(df)
+            item = _Item(frame, dtypes, time.perf_counter() - start)
+
+        with self._lock:
+            evicted = self._insert(key, item)
+        for old_key, old in evicted:
+            self._spill(old_key, old)
+        return df, digest
+
+    def _insert(self, key, item):
+        """Add to the memory tier; return the entries evicted to make room.
+
+        Call with the lock held. Evicted entries stay readable from
+        `_spilling` until `_spill` has written them out.
+        """
+        self._memory[key] = item
+        self._memory.move_to_end(key)
+
+        evicted = []
+        used = sum(i.size for i in self._memory.values())
+        while used > self.memory_bytes and len(self._memory) > 1:
+            old_key, old = self._memory.popitem(last=False)
+            used -= old.size
+            self.stats["evictions"] += 1
+            self._spilling[old_key] = old
+            evicted.append((old_key, old))
+        return evicted
+
+    def _spill(self, key, item):
+        """Write an evicted frame to Parquet (outside the lock) and index it."""
+        path = None
+        if item.size <= self.disk_bytes:
+            try:
+                path = self._spill_dir() / f"{key[0]}_{abs(hash(key[1])):x}.parquet"
+                item.frame.to_parquet(path, index=True)
+            except (OSError, ImportError, ValueError):
+                path = None
+
+        stale = []
+        with self._lock:
+            self._spilling.pop(key, None)
+            if path is None or key in self._memory:
+                # Unspillable, or parsed again while being written
+                stale.append(path)
+            else:
+                item.path = str(path)
+                item.frame = None
+                self._disk[key] = item
+
+                used = sum(i.size for i in self._disk.values())
+                while used > self.disk_bytes and self._disk:
+                    _, old = self._disk.popitem(last=False)
+                    used -= old.size
+                    stale.append(old.path)
+        for p in stale:
+            if p is not None:
+                _remove(p)
+
+    def _spill_dir(self):
+        with self._lock:
+            if self.cache_dir is None:
+                # Disk entries are indexed in memory only: one private
+                # directory per process, removed at exit
+                self.cache_root.mkdir(parents=True, exist_ok=True)
+                self.cache_dir = Path(tempfile.mkdtemp(dir=self.cache_root))
+                atexit.register(shutil.rmtree, self.cache_dir, ignore_errors=True)
+            return self.cache_dir
+
+    def summary(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": (lookups - self.stats["misses"]) / lookups if lookups else None,
+                "memory_entries": len(self._memory),
+                "memory_mb": sum(i.size for i in self._memory.values()) / MB,
+                "disk_entries": len(self._disk),
+                "disk_mb": sum(i.size for i in self._disk.values()) / MB,
+            }
+
+
+_store = UploadStore()
+
+
+def read_upload(uploaded_file, on_miss=None, **kwargs):
+    """`pd.read_csv` for a Streamlit upload, through the shared store.
+
+    Returns `(DataFrame, digest)`; the digest identifies the upload's
+    content and can key per-upload results. `on_miss(data)` is a cheap
+    pre-parse check (e.g. validating a prefix) that cached uploads skip.
+    """
+    return _store.read_csv(uploaded_file.getvalue(), on_miss=on_miss, **kwargs)
+
+
+def render_upload_stats():
+    s = _store.summary()
+    with st.sidebar.expander("Upload cache"):
+        rate = f"{s['hit_rate']:.0%}" if s["hit_rate"] is not None else "–"
+        st.caption(
+            f"Hit rate {rate} ({s['hits'] + s['disk_hits']} hits, {s['misses']} misses), "
+            f"{s['parse_s_saved']:.1f}s of parsing saved"
+        )
+        st.caption(
+            f"{s['memory_entries']} in memory ({s['memory_mb']:.1f} MB), "
+            f"{s['disk_entries']} on disk ({s['disk_mb']:.1f} MB)"
+        )